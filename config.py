@@ -47,7 +47,7 @@ CAMERA_FPS = 30  # Target camera FPS (Raspberry Pi Camera Module 3 Wide supports
 CAMERA_ROTATION = 180  # Rotate camera 180 degrees (0, 90, 180, 270) - set to 180 if camera is upside down
 CAMERA_FLIP_HORIZONTAL = False  # Flip horizontally (mirror)
 CAMERA_FLIP_VERTICAL = False  # Flip vertically
-CAMERA_SWAP_RB = True  # Swap red and blue channels (fixes color swap issue)
+CAMERA_SWAP_RB = True  # Only test_apriltag_detection reads this (Picamera2 RGB -> BGR); other camera paths ignore it
 CAMERA_SWAP_LEFT_RIGHT = True  # Swap left/right arm detection (needed when camera is rotated 180°)
 # YOLO Model Configuration
 # Use NCNN format for better performance on Raspberry Pi (ARM architecture)
@@ -121,11 +121,14 @@ FRAME_CACHE_TTL = 0.05  # Frame cache time-to-live (seconds)
 VISUAL_UPDATE_INTERVAL = 0.033  # Visual detection update interval (seconds) - lower = higher FPS (0.033 = 30 FPS max, 0.05 = 20 FPS max)
 ENABLE_PERFORMANCE_MONITORING = True  # Track FPS and performance metrics
 FRAME_SKIP_INTERVAL = 3  # Process every Nth frame (1 = all frames, 2 = every other, etc.)
+CONTROL_LOOP_PERIOD = 0.01  # Main control loop period (seconds) - loop is paced to this deadline, not slept after
 
 # YOLO Performance Optimization
-YOLO_INFERENCE_SIZE = 640  # YOLO input image size (matches camera 640x480, no resize needed)
+YOLO_INFERENCE_SIZE = 640  # YOLO input long side (pose tracker keeps frame aspect, e.g. 640x480; 320 ~4x less compute)
 YOLO_MAX_DET = 5  # Maximum detections per image (lower = faster, default is 300)
 YOLO_AGNOSTIC_NMS = True  # Class-agnostic NMS (faster, slight accuracy tradeoff)
+OPENCV_NUM_THREADS = 1  # OpenCV worker threads (per-frame rotate/flip/convert are small; leaves the Pi's cores to YOLO)
+TORCH_NUM_THREADS = 3  # PyTorch intra-op threads when USE_NCNN=False (leaves one core for camera/OpenCV)
 # Note: imgsz resizes internally - doesn't reduce field of view, but resizing has CPU overhead
 # Better to match camera resolution (640) and use other optimizations:
 # - max_det: Limits detections (biggest speedup)
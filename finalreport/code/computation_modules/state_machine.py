@@ -28,27 +28,30 @@ DESIGN DECISIONS:
 """
 
 import time
-from enum import Enum, auto
+from enum import IntEnum
 import config
 
-
-class State(Enum):
-    """System states"""
-    IDLE = auto()  # Wake word only - no voice recognizer (exclusive mic access)
-    ACTIVE = auto()  # Post-wake-word: voice commands and visual detection for mode selection
-    TRACKING_USER = auto()
-    FOLLOWING_USER = auto()
-    FINDING_LOST_USER = auto()  # User lost during following - searching with pose detection
-    STOPPED = auto()  # At target distance, waiting for trash collection
-    HOME = auto()  # Returning to home marker (turn 180, detect marker, drive to it)
-    MANUAL_MODE = auto()
-    RADD_MODE = auto()  # Drive towards users not wearing full pants or closed-toe shoes
+# Bound once at import; `if __debug__ and _DEBUG_STATE` is stripped under python -O
+_DEBUG_STATE = getattr(config, 'DEBUG_STATE', False)
+
+
+class State(IntEnum):
+    """System states (explicit small ints so states can index a dispatch list)"""
+    IDLE = 0  # Wake word only - no voice recognizer (exclusive mic access)
+    ACTIVE = 1  # Post-wake-word: voice commands and visual detection for mode selection
+    TRACKING_USER = 2
+    FOLLOWING_USER = 3
+    FINDING_LOST_USER = 4  # User lost during following - searching with pose detection
+    STOPPED = 5  # At target distance, waiting for trash collection
+    HOME = 6  # Returning to home marker (turn 180, detect marker, drive to it)
+    MANUAL_MODE = 7
+    RADD_MODE = 8  # Drive towards users not wearing full pants or closed-toe shoes
     # Legacy states (for compatibility)
-    DORMANT = auto()  # Deprecated - use IDLE instead
-    RETURNING_TO_START = auto()  # Deprecated - use HOME instead
-    DRIVING_TO_USER = auto()
-    STOPPED_AT_USER = auto()
-    RETURNING = auto()
+    DORMANT = 9  # Deprecated - use IDLE instead
+    RETURNING_TO_START = 10  # Deprecated - use HOME instead
+    DRIVING_TO_USER = 11
+    STOPPED_AT_USER = 12
+    RETURNING = 13
 
 
 class StateMachine:
@@ -71,10 +74,12 @@ class StateMachine:
         self.state_enter_time = time.time()  # Track when current state was entered
         self.tracking_timeout = tracking_timeout  # Timeout for tracking states (30 seconds)
 
+        self.start_position = None  # Set via set_start_position() for auto-return
+
         self.forward_start_time = None
         self.forward_elapsed_time = 0.0 
 
-        if config.DEBUG_STATE:
+        if __debug__ and _DEBUG_STATE:
             print(f"[SM] initial state: {self.state.name}")
     
 
@@ -99,8 +104,13 @@ class StateMachine:
         - Stores old state for logging and debugging
         - Resets state entry time for timeout calculations
         - Enables state-specific behavior in main control loop
+        - Re-entering the current state is a no-op so a redundant request
+          does not reset the timeout clock (masking a stuck state)
         """
-        if config.DEBUG_STATE:
+        if new_state is self.state:
+            return
+
+        if __debug__ and _DEBUG_STATE:
             print(f"[SM] {self.state.name} -> {new_state.name}")
        
         self.old_state = self.state  # Store previous state
@@ -113,10 +123,11 @@ class StateMachine:
     
     def set_start_position(self, position):
         self.start_position = position
-        print(f"[StateMachine] Start position set: {position}")
+        if __debug__ and _DEBUG_STATE:
+            print(f"[StateMachine] Start position set: {position}")
     
     def get_start_position(self):
-        return getattr(self, 'start_position', None)
+        return self.start_position
 
 
 if __name__ == '__main__':
@@ -72,7 +72,7 @@ CAMERA_FPS = 30  # Target camera FPS (Raspberry Pi Camera Module 3 Wide supports
 CAMERA_ROTATION = 180  # Rotate camera 180 degrees (0, 90, 180, 270) - set to 180 if camera is upside down
 CAMERA_FLIP_HORIZONTAL = False  # Flip horizontally (mirror)
 CAMERA_FLIP_VERTICAL = False  # Flip vertically
-CAMERA_SWAP_RB = True  # Swap red and blue channels (fixes color swap issue)
+CAMERA_SWAP_RB = True  # Only the ArUco detector reads this (Picamera2 RGB -> BGR); other camera paths ignore it
 CAMERA_SWAP_LEFT_RIGHT = True  # Swap left/right arm detection (needed when camera is rotated 180°)
 # YOLO Model Configuration
 # DESIGN CHOICE: NCNN vs PyTorch
@@ -158,6 +158,7 @@ FRAME_CACHE_TTL = 0.05  # Frame cache time-to-live (50ms - matches frame rate)
 VISUAL_UPDATE_INTERVAL = 0.033  # Visual detection update interval (33ms = 30 FPS max)
 ENABLE_PERFORMANCE_MONITORING = True  # Track FPS and performance metrics for optimization
 FRAME_SKIP_INTERVAL = 3  # Process every 3rd frame (reduces CPU load by 66%, maintains 10 FPS processing)
+MAX_TICKS_PER_FRAME = 4  # Max state handlers run per main-loop iteration (extra ticks only follow a state transition)
 
 # YOLO Performance Optimization
 YOLO_INFERENCE_SIZE = 640  # YOLO input image size (matches camera 640x480, no resize needed)
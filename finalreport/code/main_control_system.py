@@ -39,6 +39,8 @@ KEY DESIGN DECISIONS:
 import sys
 import time
 import signal
+import logging
+import threading
 import os
 from pathlib import Path
 
@@ -58,6 +60,9 @@ from logger import setup_logger, log_error, log_warning, log_info, log_debug
 from optimizations import FrameCache, PerformanceMonitor, conditional_log, skip_frames
 from test_apriltag_detection import ArUcoDetector
 
+# Bound once at import for the per-loop performance log check
+_DEBUG_MODE = getattr(config, 'DEBUG_MODE', False)
+
 
 class BinDieselSystem:
     """Main system controller"""
@@ -80,7 +85,8 @@ class BinDieselSystem:
         # Control flags 
         self.last_visual_update = 0
         self.visual_update_interval = config.VISUAL_UPDATE_INTERVAL  # Use configurable update interval
-        self.running = True
+        # Stop flag: set() from the signal handler also wakes any interruptible wait below
+        self._stop_event = threading.Event()
         self._wake_word_stopped = False  # Track if wake word detector has been stopped
 
         
@@ -214,6 +220,19 @@ class BinDieselSystem:
         self.frame_skip_counter = 0  # Counter for frame skipping
         # self.current_manual_command = None  # Current active manual command
 
+        # STATE DISPATCH: State values are small ints, so handlers live in a list
+        # indexed by state (states without a handler map to None)
+        self._dispatch_list = [None] * (max(State) + 1)
+        self._dispatch_list[State.IDLE] = self.handle_idle_state
+        self._dispatch_list[State.TRACKING_USER] = self.handle_tracking_user_state
+        self._dispatch_list[State.FOLLOWING_USER] = self.handle_following_user_state
+        self._dispatch_list[State.STOPPED] = self.handle_stopped_state
+        self._dispatch_list[State.HOME] = self.handle_home_state
+
+        # BATCH TICKS: Run up to N state handlers per loop iteration when a handler
+        # transitions state, so the new state reacts without waiting a full loop delay
+        self.max_ticks_per_frame = max(1, getattr(config, 'MAX_TICKS_PER_FRAME', 1))
+
         self.sleeptimer = 0.3 # for re-finding user 
         self.search_argle = 20.0 
         
@@ -239,7 +258,7 @@ class BinDieselSystem:
     def signal_handler(self, signum, frame):
         """Handle shutdown signals"""
         log_info(self.logger, "Shutdown signal received, cleaning up...")
-        self.running = False
+        self._stop_event.set()
 
     ##############################################################################################################################_transition_to
     #################################################################################################################################
@@ -254,6 +273,13 @@ class BinDieselSystem:
             log_info(self.logger, "*" * 70)
         self.sm.transition_to(new_state)
 
+    def safe_stop(self):
+        """Stop the motor and center the servo"""
+        # Go through the controllers so their cached duty cycles stay in sync
+        self.motor.stop()
+        self.servo.center()
+        self.last_servo_angle = 0.0
+
     def safe_center_servo(self):
         """Center servo only if it's not already centered"""
         if self.last_servo_angle != 0.0:
@@ -403,7 +429,7 @@ class BinDieselSystem:
             self.servo.set_angle(self.last_error_angle * -2)
             self.last_error_angle = self.last_error_angle * -1  # Flip for next time
             self.target_track_id = None  # Clear target track_id (allow re-tracking)
-            time.sleep(self.sleeptimer)
+            self._stop_event.wait(self.sleeptimer)  # Returns early on shutdown
             # Gradually increase search time if user not found (up to 2.0 seconds)
             if self.sleeptimer < 2.0:
                 self.sleeptimer += 0.1
@@ -476,8 +502,7 @@ class BinDieselSystem:
             self.servo.turn_left(1.0)  # Max left turn
             self.motor.forward(config.MOTOR_TURN)
             time.sleep(config.TURN_180_DURATION)  # Turn for specified duration
-            self.servo.center()  # Center steering
-            self.motor.stop()
+            self.safe_stop()  # Center steering and stop
             time.sleep(0.5)
             self.return_turn_complete = True
             log_info(self.logger, "Turn complete, scanning for ArUco marker...")
@@ -491,8 +516,7 @@ class BinDieselSystem:
         # - Angle calculation for steering control
         if self.aruco_detector is None:
             log_warning(self.logger, "ArUco detector not available", "Cannot return to home")
-            self.motor.stop()
-            self.servo.center()
+            self.safe_stop()
             if hasattr(self, 'return_turn_complete'):
                 delattr(self, 'return_turn_complete')
             self._transition_to(State.IDLE)
@@ -536,8 +560,7 @@ class BinDieselSystem:
                     self.servo.turn_left(0.5)  # Max left turn
                     self.motor.forward(config.MOTOR_TURN)
                     time.sleep(config.TURN_180_DURATION - 0.2)  # Turn for specified duration
-                    self.servo.center()  # Center steering
-                    self.motor.stop()
+                    self.safe_stop()  # Center steering and stop
 
                     if hasattr(self, 'return_turn_complete'):
                         delattr(self, 'return_turn_complete')
@@ -582,7 +605,7 @@ class BinDieselSystem:
                 sweep_angle = self.search_argle  # Start with +20° or -20°
                 self.servo.set_angle(sweep_angle)  # Set steering angle
                 self.search_argle = sweep_angle * -1  # Flip for next iteration (alternating search)
-                time.sleep(self.sleeptimer+0.7)  # Search for increasing duration
+                self._stop_event.wait(self.sleeptimer+0.7)  # Search for increasing duration (returns early on shutdown)
                 # Gradually increase search time (up to 3.0 seconds)
                 if self.sleeptimer < 3.0:
                     self.sleeptimer += 1.0
@@ -590,72 +613,89 @@ class BinDieselSystem:
         except Exception as e:
             log_error(self.logger, e, "Error in return to home detection")
             # On error, just stop
-            self.motor.stop()
-            self.servo.center()
+            self.safe_stop()
             if hasattr(self, 'return_turn_complete'):
                 delattr(self, 'return_turn_complete')
             self._transition_to(State.IDLE)
     
+    ########################################################################################################################### _dispatch_state
+    #############################################################################################################################################
+    def _dispatch_state(self, state):
+        """Route to the appropriate handler for the given state"""
+        handler = self._dispatch_list[state]  # State is an IntEnum - plain list index
+        if handler is not None:
+            handler()
+
+    def _check_tof_emergency(self, state):
+        """
+        Run the TOF emergency stop for the given state
+
+        Returns:
+            True if the stop path ran and the rest of the frame should be skipped
+        """
+        is_turning_in_home = (state == State.HOME and not hasattr(self, 'return_turn_complete'))
+
+        # TOF EMERGENCY STOP: Safety feature using VL53L0X Time-of-Flight sensor
+        # DESIGN: 900mm safety trigger distance provides ~100mm buffer after accounting for:
+        # - Reaction time: ~50ms at MOTOR_MEDIUM speed
+        # - Braking distance: Proportional to speed
+        # This ensures the car stops before hitting obstacles
+        # IMPORTANT: TOF check is disabled during 180° turn in HOME state to prevent false triggers
+        if self.tof and self.tof.detect() and state != State.IDLE and state != State.STOPPED :
+            # Skip TOF check if we're currently turning in HOME state
+            # During the 180° turn, the car may detect the ground or nearby objects
+            # This is a false positive - we disable TOF during the turn
+            if is_turning_in_home:
+                log_info(self.logger, "TOF check disabled during 180° turn (preventing false triggers)")
+                return True  # Skip TOF check during turn
+
+            # TOF triggered - handle emergency stop
+            if state == State.HOME:
+                # In HOME state after turn - stop and return to IDLE
+                log_info(self.logger, "=" * 70)
+                log_info(self.logger, "EMERGENCY STOP: TOF sensor triggered in HOME state!")
+                log_info(self.logger, "=" * 70)
+
+                self.motor.stop()  # Stop before turning
+                time.sleep(5.0)
+                self.servo.turn_left(1.0)  # Max left turn
+                self.motor.forward(config.MOTOR_TURN)
+                time.sleep(config.TURN_180_DURATION)  # Turn for specified duration
+                self.safe_stop()  # Center steering and stop
+                if hasattr(self, 'return_turn_complete'):
+                    delattr(self, 'return_turn_complete')
+                self._transition_to(State.IDLE)
+                return True  # Skip all other processing this frame
+
+            else:
+                # Other states - normal emergency stop
+                log_info(self.logger, "=" * 70)
+                log_info(self.logger, "EMERGENCY STOP: TOF sensor triggered!")
+                log_info(self.logger, "=" * 70)
+                self.safe_stop()
+
+                # Transition to STOPPED state if currently in a movement state
+                if state in (State.FOLLOWING_USER, State.TRACKING_USER):
+                    self._transition_to(State.STOPPED)
+                else: 
+                    self._transition_to(State.IDLE)
+                time.sleep(0.05)  # Small delay to allow motor to stop
+                return True  # Skip all other processing this frame
+
+        return False
+
     ################################################################################################################################### run(self)
     #############################################################################################################################################
     def run(self):
         """Main control loop"""
         try:
-            while self.running:
+            while not self._stop_event.is_set():
 
                 state = self.sm.get_state()
                 
-                is_turning_in_home = (state == State.HOME and not hasattr(self, 'return_turn_complete'))
-                
-                # TOF EMERGENCY STOP: Safety feature using VL53L0X Time-of-Flight sensor
-                # DESIGN: 900mm safety trigger distance provides ~100mm buffer after accounting for:
-                # - Reaction time: ~50ms at MOTOR_MEDIUM speed
-                # - Braking distance: Proportional to speed
-                # This ensures the car stops before hitting obstacles
-                # IMPORTANT: TOF check is disabled during 180° turn in HOME state to prevent false triggers
-                if self.tof and self.tof.detect() and state != State.IDLE and state != State.STOPPED :
-                    # Skip TOF check if we're currently turning in HOME state
-                    # During the 180° turn, the car may detect the ground or nearby objects
-                    # This is a false positive - we disable TOF during the turn
-                    if is_turning_in_home:
-                        log_info(self.logger, "TOF check disabled during 180° turn (preventing false triggers)")
-                        continue  # Skip TOF check during turn
-                    
-                    # TOF triggered - handle emergency stop
-                    if state == State.HOME:
-                        # In HOME state after turn - stop and return to IDLE
-                        log_info(self.logger, "=" * 70)
-                        log_info(self.logger, "EMERGENCY STOP: TOF sensor triggered in HOME state!")
-                        log_info(self.logger, "=" * 70)
-                        
-                        self.motor.stop()  # Stop before turning
-                        time.sleep(5.0)
-                        self.servo.turn_left(1.0)  # Max left turn
-                        self.motor.forward(config.MOTOR_TURN)
-                        time.sleep(config.TURN_180_DURATION)  # Turn for specified duration
-                        self.servo.center()  # Center steering
-                        self.motor.stop()
-                        if hasattr(self, 'return_turn_complete'):
-                            delattr(self, 'return_turn_complete')
-                        self._transition_to(State.IDLE)
-                        continue  # Skip all other processing this frame
-
-                    else:
-                        # Other states - normal emergency stop
-                        log_info(self.logger, "=" * 70)
-                        log_info(self.logger, "EMERGENCY STOP: TOF sensor triggered!")
-                        log_info(self.logger, "=" * 70)
-                        self.motor.stop()
-                        self.servo.center()
-
-                        # Transition to STOPPED state if currently in a movement state
-                        if state in (State.FOLLOWING_USER, State.TRACKING_USER):
-                            self._transition_to(State.STOPPED)
-                        else: 
-                            self._transition_to(State.IDLE)
-                        time.sleep(0.05)  # Small delay to allow motor to stop
-                        continue  # Skip all other processing this frame
-                
+                if self._check_tof_emergency(state):
+                    continue
+
                 # Update performance monitor
                 self.performance_monitor.update()
                 self.frame_count += 1
@@ -663,32 +703,33 @@ class BinDieselSystem:
                 
             
                 # Route to appropriate handler based on state
-                if state == State.IDLE:
-                    self.handle_idle_state()
-                
-                elif state == State.TRACKING_USER:
-                    self.handle_tracking_user_state()
-                
-                elif state == State.FOLLOWING_USER:
-                    self.handle_following_user_state()
-                
-                elif state == State.STOPPED:
-                    self.handle_stopped_state()
-                
-                elif state == State.HOME:
-                    self.handle_home_state()
+                self._dispatch_state(state)
+
+                # Tick again while the handler keeps moving the state machine
+                # (bounded by max_ticks_per_frame); every extra tick gets its own TOF check
+                # since a transition out of IDLE/STOPPED can start the motor
+                for _ in range(self.max_ticks_per_frame - 1):
+                    next_state = self.sm.get_state()
+                    if next_state is state:
+                        break
+                    state = next_state
+                    if self._check_tof_emergency(state):
+                        break
+                    self._dispatch_state(state)
                 
 
                 # Log performance stats periodically (every 5 seconds)
-                if self.frame_count % 500 == 0:  # ~10 FPS * 50 = 5 seconds
+                # Only compute stats / build the message if a DEBUG record would be emitted
+                if (self.frame_count % 500 == 0 and _DEBUG_MODE  # ~10 FPS * 50 = 5 seconds
+                        and self.logger.isEnabledFor(logging.DEBUG)):
                     stats = self.performance_monitor.get_stats()
                     conditional_log(self.logger, 'debug',
                                   f"Performance: FPS={stats['fps']:.1f} "
                                   f"(min={stats['fps_min']:.1f}, max={stats['fps_max']:.1f})",
-                                  config.DEBUG_MODE)
+                                  True)
                 
                 # Small delay to prevent CPU spinning
-                time.sleep(0.01)
+                self._stop_event.wait(0.01)
         
         except KeyboardInterrupt:
             log_info(self.logger, "Interrupted by user")
@@ -706,9 +747,11 @@ class BinDieselSystem:
         
         # Stop all movement
         try:
-            if hasattr(self, 'motor'):
+            if hasattr(self, 'motor') and hasattr(self, 'servo'):
+                self.safe_stop()
+            elif hasattr(self, 'motor'):
                 self.motor.stop()
-            if hasattr(self, 'servo'):
+            elif hasattr(self, 'servo'):
                 self.servo.center()
         except Exception as e:
             log_error(self.logger, e, "Error stopping motors during cleanup")
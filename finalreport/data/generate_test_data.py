@@ -8,39 +8,81 @@ Creates fake data for:
 - Steering correction path graphs
 """
 
+import argparse
+import math
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy import signal
+
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional - without it the simulation runs as plain Python
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+def _report_figure(nrows, ncols, figsize):
+    """Return a cleared, resized shared figure with fresh subplots (reused across generators)"""
+    # Imported lazily so only the generators actually run pay for matplotlib
+    import matplotlib
+    matplotlib.use('Agg')  # Non-interactive backend - figures are only saved to PNG
+    import matplotlib.pyplot as plt
+    fig = plt.figure(num='report', clear=True)
+    fig.set_size_inches(figsize)
+    return fig, fig.subplots(nrows, ncols)
+
+
+@njit(cache=True, fastmath=True)
+def _simulate_path(num_points, dt, target_x, kp, kd, speed):
+    """Simulate the PD steering recurrence; returns (car_x, car_y) arrays"""
+    car_x = np.empty(num_points)
+    car_y = np.empty(num_points)
+    car_x[0] = 0.0
+    car_y[0] = 0.0
+    last_error_x = target_x - car_x[0]
+    for i in range(1, num_points):
+        error_x = target_x - car_x[i - 1]
+        
+        # Proportional + derivative steering, clamped to servo range
+        sa = kp * error_x + kd * (error_x - last_error_x)
+        sa = -45.0 if sa < -45.0 else (45.0 if sa > 45.0 else sa)
+        
+        rad = math.radians(sa)
+        car_x[i] = car_x[i - 1] + speed * dt * math.sin(rad)
+        car_y[i] = car_y[i - 1] + speed * dt * math.cos(rad)
+        last_error_x = error_x
+    return car_x, car_y
 
 def generate_wake_word_distance_data():
     """Generate wake word detection distance data"""
     # Simulate optimal distance range: 0.5m to 3.0m
-    distances = np.linspace(0.3, 4.0, 50)
+    distances = np.linspace(0.3, 4.0, 50, dtype=np.float32)  # float32: plenty for pixel output
     
-    # Create detection probability curve (Gaussian-like, optimal around 1.5m)
-    optimal_distance = 1.5
-    detection_prob = np.exp(-((distances - optimal_distance) ** 2) / (2 * 0.8 ** 2))
-    detection_prob[distances < 0.5] *= 0.3  # Too close - lower probability
-    detection_prob[distances > 3.0] *= 0.2  # Too far - lower probability
+    # Piecewise range penalty: too close (< 0.5m) x0.3, too far (> 3.0m) x0.2
+    scale = np.where(distances < 0.5, 0.3, np.where(distances > 3.0, 0.2, 1.0)).astype(np.float32)
     
-    # Add noise
-    noise = np.random.normal(0, 0.05, len(distances))
-    detection_prob = np.clip(detection_prob + noise, 0, 1)
+    # Create detection probability curve (Gaussian-like, optimal around 1.5m) and add noise
+    optimal_distance = 1.5
+    rng = np.random.default_rng(0)  # Own seeded generator: same data in any worker process
+    noise = rng.standard_normal(len(distances), dtype=np.float32) * 0.05
+    detection_prob = np.exp(-((distances - optimal_distance) ** 2) / (2 * 0.8 ** 2)) * scale + noise
+    np.clip(detection_prob, 0, 1, out=detection_prob)
     
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = _report_figure(1, 1, (10, 6))
     ax.plot(distances, detection_prob * 100, 'b-', linewidth=2, label='Detection Rate')
     ax.axvline(x=optimal_distance, color='g', linestyle='--', linewidth=2, label=f'Optimal Distance ({optimal_distance}m)')
-    ax.fill_between(distances, 0, detection_prob * 100, alpha=0.3, color='blue')
+    ax.fill_between(distances, 0, detection_prob * 100, alpha=0.3, color='blue', rasterized=True)
     ax.set_xlabel('Distance from Microphone (m)', fontsize=12)
     ax.set_ylabel('Wake Word Detection Rate (%)', fontsize=12)
     ax.set_title('Wake Word Detection Performance vs Distance', fontsize=14, fontweight='bold')
     ax.grid(True, alpha=0.3)
     ax.legend(fontsize=10)
     ax.set_ylim(0, 105)
-    plt.tight_layout()
-    plt.savefig('wake_word_distance_graph.png', dpi=300, bbox_inches='tight')
+    fig.tight_layout()
+    fig.savefig('wake_word_distance_graph.png', dpi=300)
     print("Wake word distance graph saved")
-    plt.close()
 
 def generate_tof_safety_trigger_data():
     """Generate TOF safety trigger distance vs stopping distance data"""
@@ -55,18 +97,20 @@ def generate_tof_safety_trigger_data():
     reaction_time_ms = 50
     reaction_distance = speed_mm_per_ms * reaction_time_ms / 1000  # ~2.5mm
     
-    # Braking distance (simplified model)
-    braking_distance = 0.001 * trigger_distances  # Proportional to trigger distance
+    # Braking distance (simplified model): 0.001 * trigger distance, folded into the
+    # multiply below - stopping = 0.999 * trigger - reaction + variation
+    stopping_distances = np.empty(len(trigger_distances))
+    np.multiply(trigger_distances, 1.0 - 0.001, out=stopping_distances)
+    stopping_distances -= reaction_distance
     
-    stopping_distances = trigger_distances - reaction_distance - braking_distance
-    
-    # Add some variation
-    stopping_distances += np.random.normal(0, 10, len(trigger_distances))
+    # Add some variation (own seeded generator: same data in any worker process)
+    rng = np.random.default_rng(1)
+    stopping_distances += rng.standard_normal(len(trigger_distances)) * 10
     
     # Calculate buffer (should be ~100mm)
     buffer = trigger_distances - stopping_distances
     
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+    fig, (ax1, ax2) = _report_figure(1, 2, (14, 6))
     
     # Plot 1: Trigger distance vs stopping distance
     ax1.plot(trigger_distances, stopping_distances, 'ro-', linewidth=2, markersize=8, label='Stopping Distance')
@@ -79,7 +123,7 @@ def generate_tof_safety_trigger_data():
     ax1.legend(fontsize=10)
     
     # Plot 2: Buffer distance
-    ax2.bar(trigger_distances, buffer, width=50, color='green', alpha=0.7, edgecolor='black')
+    ax2.bar(trigger_distances, buffer, width=50, color='green', alpha=0.7, edgecolor='black', rasterized=True)
     ax2.axhline(y=100, color='r', linestyle='--', linewidth=2, label='Target Buffer (100mm)')
     ax2.set_xlabel('Safety Trigger Distance (mm)', fontsize=12)
     ax2.set_ylabel('Safety Buffer (mm)', fontsize=12)
@@ -90,17 +134,16 @@ def generate_tof_safety_trigger_data():
     # Highlight 900mm as chosen value
     idx_900 = np.argmin(np.abs(trigger_distances - 900))
     ax1.plot(trigger_distances[idx_900], stopping_distances[idx_900], 'go', markersize=12, label='Chosen (900mm)')
-    ax2.bar(trigger_distances[idx_900], buffer[idx_900], width=50, color='yellow', alpha=0.9, edgecolor='black', linewidth=2)
+    ax2.bar(trigger_distances[idx_900], buffer[idx_900], width=50, color='yellow', alpha=0.9, edgecolor='black', linewidth=2, rasterized=True)
     
-    plt.tight_layout()
-    plt.savefig('tof_safety_trigger_analysis.png', dpi=300, bbox_inches='tight')
+    fig.tight_layout()
+    fig.savefig('tof_safety_trigger_analysis.png', dpi=300)
     print("TOF safety trigger analysis saved")
-    plt.close()
 
 def generate_pwm_traces():
     """Generate PWM traces showing inverter operation"""
-    # Time array (1 second)
-    t = np.linspace(0, 1, 1000)
+    # Time array (only the plotted 200ms window)
+    t = np.linspace(0, 0.2, 200, endpoint=False, dtype=np.float32)
     
     # Motor PWM signal (40Hz, duty cycle varies)
     motor_freq = 40
@@ -113,14 +156,12 @@ def generate_pwm_traces():
     servo_left = 95.422
     servo_right = 89.318
     
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8))
+    fig, (ax1, ax2) = _report_figure(2, 1, (12, 8))
     
-    # Motor PWM trace
-    motor_signal = signal.square(2 * np.pi * motor_freq * t, duty=motor_duty/100)
-    motor_signal = (motor_signal + 1) / 2  # Normalize to 0-1
-    motor_signal = motor_signal * 3.3  # Scale to 3.3V (Raspberry Pi GPIO)
+    # Motor PWM trace: high (3.3V Raspberry Pi GPIO) for the duty fraction of each period
+    motor_signal = ((t * motor_freq) % 1.0 < motor_duty / 100.0) * np.float32(3.3)
     
-    ax1.plot(t[:200] * 1000, motor_signal[:200], 'b-', linewidth=1.5)
+    ax1.plot(t * 1000, motor_signal, 'b-', linewidth=1.5)
     ax1.set_xlabel('Time (ms)', fontsize=12)
     ax1.set_ylabel('Voltage (V)', fontsize=12)
     ax1.set_title(f'Motor PWM Signal (40Hz, {motor_duty}% duty cycle)', fontsize=13, fontweight='bold')
@@ -130,11 +171,9 @@ def generate_pwm_traces():
             bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5), fontsize=10)
     
     # Servo PWM trace (centered)
-    servo_signal = signal.square(2 * np.pi * servo_freq * t, duty=servo_center/100)
-    servo_signal = (servo_signal + 1) / 2
-    servo_signal = servo_signal * 3.3
+    servo_signal = ((t * servo_freq) % 1.0 < servo_center / 100.0) * np.float32(3.3)
     
-    ax2.plot(t[:200] * 1000, servo_signal[:200], 'r-', linewidth=1.5)
+    ax2.plot(t * 1000, servo_signal, 'r-', linewidth=1.5)
     ax2.set_xlabel('Time (ms)', fontsize=12)
     ax2.set_ylabel('Voltage (V)', fontsize=12)
     ax2.set_title(f'Servo PWM Signal (50Hz, {servo_center}% duty cycle - Centered)', fontsize=13, fontweight='bold')
@@ -143,10 +182,9 @@ def generate_pwm_traces():
     ax2.text(0.5, 3.5, f'Duty Cycle: {servo_center}%\nFrequency: {servo_freq}Hz\nPosition: Centered', 
             bbox=dict(boxstyle='round', facecolor='lightcoral', alpha=0.5), fontsize=10)
     
-    plt.tight_layout()
-    plt.savefig('pwm_traces.png', dpi=300, bbox_inches='tight')
+    fig.tight_layout()
+    fig.savefig('pwm_traces.png', dpi=300)
     print("PWM traces saved")
-    plt.close()
 
 def generate_steering_correction_path():
     """Generate steering correction path data showing efficiency"""
@@ -158,51 +196,24 @@ def generate_steering_correction_path():
     target_x = 2.0
     target_y = 5.0
     
-    # Initial car position
-    car_x = [0.0]
-    car_y = [0.0]
-    
-    # Simulate corrective steering (PID-like behavior)
+    # Simulate corrective steering (PID-like behavior) from the origin
     kp = 0.3  # Proportional gain
     kd = 0.1  # Derivative gain
-    
-    error_x = target_x - car_x[0]
-    error_y = target_y - car_y[0]
-    last_error_x = error_x
-    
-    for i in range(1, num_points):
-        # Calculate error
-        error_x = target_x - car_x[-1]
-        error_y = target_y - car_y[-1]
-        
-        # Calculate steering angle (proportional + derivative)
-        steering_angle = kp * error_x + kd * (error_x - last_error_x)
-        steering_angle = np.clip(steering_angle, -45, 45)  # Clamp to servo range
-        
-        # Update position (simplified model)
-        speed = 0.5  # m/s
-        dt = t[i] - t[i-1]
-        car_x.append(car_x[-1] + speed * dt * np.sin(np.radians(steering_angle)))
-        car_y.append(car_y[-1] + speed * dt * np.cos(np.radians(steering_angle)))
-        
-        last_error_x = error_x
+    speed = 0.5  # m/s
+    dt = t[1] - t[0]  # Uniform time step
+    car_x, car_y = _simulate_path(num_points, dt, target_x, kp, kd, speed)
     
     # Calculate path efficiency
     # Direct distance (straight line)
     direct_distance = np.sqrt(target_x**2 + target_y**2)
     
-    # Actual path distance
-    path_distances = []
-    for i in range(1, len(car_x)):
-        dx = car_x[i] - car_x[i-1]
-        dy = car_y[i] - car_y[i-1]
-        path_distances.append(np.sqrt(dx**2 + dy**2))
-    actual_path_distance = sum(path_distances)
+    # Actual path distance (sum of segment lengths)
+    actual_path_distance = np.hypot(np.diff(car_x), np.diff(car_y)).sum()
     
     efficiency = direct_distance / actual_path_distance
     
     # Plot
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+    fig, (ax1, ax2) = _report_figure(1, 2, (14, 6))
     
     # Plot 1: Path visualization
     ax1.plot(car_x, car_y, 'b-', linewidth=2, label='Corrective Path', marker='o', markersize=4)
@@ -217,14 +228,7 @@ def generate_steering_correction_path():
     ax1.set_aspect('equal')
     
     # Plot 2: PWM updates over time
-    steering_angles = []
-    for i in range(len(car_x) - 1):
-        if i == 0:
-            error_x = target_x - car_x[0]
-        else:
-            error_x = target_x - car_x[i]
-        steering_angle = kp * error_x
-        steering_angles.append(np.clip(steering_angle, -45, 45))
+    steering_angles = np.clip(kp * (target_x - car_x[:-1]), -45, 45)
     
     ax2.plot(t[:-1], steering_angles, 'g-', linewidth=2, marker='o', markersize=4)
     ax2.axhline(y=0, color='k', linestyle='--', linewidth=1, alpha=0.5)
@@ -237,10 +241,9 @@ def generate_steering_correction_path():
     fig.text(0.5, 0.02, f'Path Efficiency: {efficiency:.3f} (Direct Distance: {direct_distance:.2f}m, Actual Path: {actual_path_distance:.2f}m)',
             ha='center', fontsize=11, bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
     
-    plt.tight_layout()
-    plt.savefig('steering_correction_path.png', dpi=300, bbox_inches='tight')
+    fig.tight_layout(rect=(0, 0.05, 1, 1))  # Leave room for the efficiency footer
+    fig.savefig('steering_correction_path.png', dpi=300)
     print("Steering correction path saved")
-    plt.close()
     
     return efficiency
 
@@ -257,14 +260,14 @@ def generate_apriltag_vs_aruco_comparison():
     aruco_latency = np.array([15, 18, 20, 22, 28])  # ms
     aruco_detection_rate = np.array([92, 95, 97, 90, 75])  # %
     
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+    fig, (ax1, ax2) = _report_figure(1, 2, (14, 6))
     
     x = np.arange(len(scenarios))
     width = 0.35
     
     # Latency comparison
-    ax1.bar(x - width/2, apriltag_latency, width, label='AprilTag', color='#FF6B6B', alpha=0.8)
-    ax1.bar(x + width/2, aruco_latency, width, label='ArUco', color='#4ECDC4', alpha=0.8)
+    ax1.bar(x - width/2, apriltag_latency, width, label='AprilTag', color='#FF6B6B', alpha=0.8, rasterized=True)
+    ax1.bar(x + width/2, aruco_latency, width, label='ArUco', color='#4ECDC4', alpha=0.8, rasterized=True)
     ax1.set_xlabel('Test Scenario', fontsize=12)
     ax1.set_ylabel('Inference Latency (ms)', fontsize=12)
     ax1.set_title('AprilTag vs ArUco: Inference Latency', fontsize=13, fontweight='bold')
@@ -274,8 +277,8 @@ def generate_apriltag_vs_aruco_comparison():
     ax1.grid(True, alpha=0.3, axis='y')
     
     # Detection rate comparison
-    ax2.bar(x - width/2, apriltag_detection_rate, width, label='AprilTag', color='#FF6B6B', alpha=0.8)
-    ax2.bar(x + width/2, aruco_detection_rate, width, label='ArUco', color='#4ECDC4', alpha=0.8)
+    ax2.bar(x - width/2, apriltag_detection_rate, width, label='AprilTag', color='#FF6B6B', alpha=0.8, rasterized=True)
+    ax2.bar(x + width/2, aruco_detection_rate, width, label='ArUco', color='#4ECDC4', alpha=0.8, rasterized=True)
     ax2.set_xlabel('Test Scenario', fontsize=12)
     ax2.set_ylabel('Detection Rate (%)', fontsize=12)
     ax2.set_title('AprilTag vs ArUco: Detection Reliability', fontsize=13, fontweight='bold')
@@ -285,18 +288,45 @@ def generate_apriltag_vs_aruco_comparison():
     ax2.legend(fontsize=10)
     ax2.grid(True, alpha=0.3, axis='y')
     
-    plt.tight_layout()
-    plt.savefig('apriltag_vs_aruco_comparison.png', dpi=300, bbox_inches='tight')
+    fig.tight_layout()
+    fig.savefig('apriltag_vs_aruco_comparison.png', dpi=300)
     print("AprilTag vs ArUco comparison saved")
-    plt.close()
 
-if __name__ == '__main__':
+GENERATORS = {
+    'wake_word': generate_wake_word_distance_data,
+    'tof': generate_tof_safety_trigger_data,
+    'pwm': generate_pwm_traces,
+    'steering': generate_steering_correction_path,
+    'apriltag_vs_aruco': generate_apriltag_vs_aruco_comparison,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate test data and graphs for the final report')
+    parser.add_argument('graphs', nargs='*', metavar='GRAPH',
+                        help=f"Graphs to generate (default: all). Choices: {', '.join(GENERATORS)}")
+    parser.add_argument('--workers', type=int, default=4,
+                        help='Worker processes for rendering graphs in parallel (default: 4, 1 = sequential)')
+    args = parser.parse_args()
+    unknown = [name for name in args.graphs if name not in GENERATORS]
+    if unknown:
+        parser.error(f"unknown graph(s): {', '.join(unknown)}")
+    
     print("Generating test data and graphs...")
-    generate_wake_word_distance_data()
-    generate_tof_safety_trigger_data()
-    generate_pwm_traces()
-    efficiency = generate_steering_correction_path()
-    generate_apriltag_vs_aruco_comparison()
+    names = args.graphs or list(GENERATORS)
+    # Each generator is independent and writes its own PNG, so render them in parallel
+    if args.workers > 1 and len(names) > 1:
+        with ProcessPoolExecutor(max_workers=min(args.workers, len(names))) as executor:
+            futures = {name: executor.submit(GENERATORS[name]) for name in names}
+            results = {name: future.result() for name, future in futures.items()}
+    else:
+        results = {name: GENERATORS[name]() for name in names}
+    efficiency = results.get('steering')
     print(f"\nAll graphs generated successfully!")
-    print(f"Steering correction path efficiency: {efficiency:.3f}")
+    if efficiency is not None:
+        print(f"Steering correction path efficiency: {efficiency:.3f}")
+
+
+if __name__ == '__main__':
+    main()
 
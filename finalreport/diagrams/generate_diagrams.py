@@ -4,13 +4,53 @@ Generate diagrams for final report
 Creates state machine, system block, and architecture diagrams
 """
 
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-from matplotlib.patches import FancyBboxPatch, FancyArrowPatch, Circle, Rectangle
+import argparse
+import hashlib
+import inspect
+from functools import wraps
+from pathlib import Path
 import numpy as np
 
-def create_state_machine_diagram():
+def _cached_diagram(basename):
+    """
+    Skip regenerating a diagram whose drawing code has not changed
+    
+    The diagrams are pure functions of hardcoded layouts, so a stamp file keyed by
+    a hash of the function (and shared helper) source marks the output as up to date.
+    Pass force=True to redraw anyway; fmt selects the output format (png/svg/pdf).
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(force=False, fmt='png'):
+            output_path = f"{basename}.{fmt}"
+            source = inspect.getsource(func) + inspect.getsource(_add_box_collection)
+            key = hashlib.md5(source.encode()).hexdigest()[:8]
+            stamp = Path(f"{output_path}.{key}.stamp")
+            if not force and stamp.exists() and Path(output_path).exists():
+                print(f"{output_path} is up to date (cached)")
+                return
+            
+            func(output_path)
+            
+            # Drop stamps for older versions of the drawing code
+            for stale in Path(output_path).parent.glob(f"{Path(output_path).name}.*.stamp"):
+                stale.unlink()
+            stamp.touch()
+        return wrapper
+    return decorator
+
+def _add_box_collection(ax, boxes, facecolors, linewidths=2):
+    """Add rounded boxes to the axes as a single PatchCollection artist"""
+    from matplotlib.collections import PatchCollection
+    ax.add_collection(PatchCollection(boxes, facecolors=facecolors, edgecolors='black',
+                                      linewidths=linewidths, match_original=False))
+
+@_cached_diagram('state_machine_diagram')
+def create_state_machine_diagram(output_path='state_machine_diagram.png'):
     """Create state machine diagram showing all states and transitions"""
+    import matplotlib.pyplot as plt
+    from matplotlib.patches import FancyBboxPatch, FancyArrowPatch
+    
     fig, ax = plt.subplots(1, 1, figsize=(14, 10))
     ax.set_xlim(0, 10)
     ax.set_ylim(0, 10)
@@ -34,19 +74,14 @@ def create_state_machine_diagram():
         'HOME': '#B4FFB4',  # Light green
     }
     
-    # Draw states
-    state_patches = {}
+    # Draw states (rounded rectangles in one collection, labels on top)
+    boxes = [FancyBboxPatch((x-0.8, y-0.4), 1.6, 0.8, boxstyle="round,pad=0.1")
+             for x, y in states.values()]
+    _add_box_collection(ax, boxes, [state_colors[state_name] for state_name in states])
     for state_name, (x, y) in states.items():
-        # Create rounded rectangle for state
-        box = FancyBboxPatch((x-0.8, y-0.4), 1.6, 0.8,
-                             boxstyle="round,pad=0.1",
-                             facecolor=state_colors[state_name],
-                             edgecolor='black',
-                             linewidth=2)
-        ax.add_patch(box)
         ax.text(x, y, state_name, ha='center', va='center', 
                 fontsize=10, fontweight='bold')
-        state_patches[state_name] = (x, y)
+    state_patches = dict(states)
     
     # Define transitions
     transitions = [
@@ -59,71 +94,63 @@ def create_state_machine_diagram():
         ('FOLLOWING_USER', 'HOME', 'Emergency'),
     ]
     
+    # Calculate all arrow positions at once: (N, 2) state centers, offset along the
+    # unit direction to the edge of each box (half-width 0.8, half-height 0.4)
+    transitions = [t for t in transitions if t[0] in state_patches and t[1] in state_patches]
+    starts = np.array([state_patches[from_state] for from_state, _, _ in transitions], dtype=float)
+    ends = np.array([state_patches[to_state] for _, to_state, _ in transitions], dtype=float)
+    delta = ends - starts
+    unit = delta / np.linalg.norm(delta, axis=1, keepdims=True)
+    box_half = np.array([0.8, 0.4])
+    start_pts = starts + unit * box_half
+    end_pts = ends - unit * box_half
+    mid_pts = (start_pts + end_pts) / 2
+    
     # Draw transitions
-    for from_state, to_state, label in transitions:
-        if from_state in state_patches and to_state in state_patches:
-            x1, y1 = state_patches[from_state]
-            x2, y2 = state_patches[to_state]
-            
-            # Calculate arrow position
-            dx = x2 - x1
-            dy = y2 - y1
-            dist = np.sqrt(dx**2 + dy**2)
-            
-            # Start and end points (on edge of boxes)
-            start_x = x1 + 0.8 * dx / dist if abs(dx) > 0.01 else x1
-            start_y = y1 + 0.4 * dy / dist if abs(dy) > 0.01 else y1
-            end_x = x2 - 0.8 * dx / dist if abs(dx) > 0.01 else x2
-            end_y = y2 - 0.4 * dy / dist if abs(dy) > 0.01 else y2
-            
-            # Draw arrow
-            arrow = FancyArrowPatch((start_x, start_y), (end_x, end_y),
-                                   arrowstyle='->', mutation_scale=20,
-                                   linewidth=1.5, color='black')
-            ax.add_patch(arrow)
-            
-            # Add label
-            mid_x = (start_x + end_x) / 2
-            mid_y = (start_y + end_y) / 2
-            ax.text(mid_x, mid_y + 0.2, label, ha='center', va='bottom',
-                   fontsize=8, bbox=dict(boxstyle='round,pad=0.3', 
-                                        facecolor='white', alpha=0.8))
+    for (_, _, label), start, end, (mid_x, mid_y) in zip(transitions, start_pts, end_pts, mid_pts):
+        arrow = FancyArrowPatch(tuple(start), tuple(end),
+                               arrowstyle='->', mutation_scale=20,
+                               linewidth=1.5, color='black')
+        ax.add_patch(arrow)
+        
+        # Add label
+        ax.text(mid_x, mid_y + 0.2, label, ha='center', va='bottom',
+               fontsize=8, bbox=dict(boxstyle='round,pad=0.3', 
+                                    facecolor='white', alpha=0.8))
     
     ax.set_title('Bin Diesel State Machine', fontsize=16, fontweight='bold', pad=20)
-    plt.tight_layout()
-    plt.savefig('state_machine_diagram.png', dpi=300, bbox_inches='tight')
-    print("State machine diagram saved to state_machine_diagram.png")
+    # dpi only applies to PNG; SVG/PDF are written as vector output with no rasterization
+    plt.savefig(output_path, dpi=300, bbox_inches='tight')  # Single layout pass (no tight_layout)
+    print(f"State machine diagram saved to {output_path}")
     plt.close()
 
-def create_system_block_diagram():
+@_cached_diagram('system_block_diagram')
+def create_system_block_diagram(output_path='system_block_diagram.png'):
     """Create system block diagram showing all components"""
+    import matplotlib.pyplot as plt
+    import matplotlib.patches as mpatches
+    from matplotlib.patches import FancyBboxPatch, FancyArrowPatch
+    
     fig, ax = plt.subplots(1, 1, figsize=(16, 10))
     ax.set_xlim(0, 12)
     ax.set_ylim(0, 10)
     ax.axis('off')
     
-    # Define component positions and colors
-    components = {
-        'Raspberry Pi': (6, 9, '#FFE5B4'),  # Yellow
-        'Camera\n(PiCamera2)': (2, 7, '#FFE5B4'),
-        'Microphone': (4, 7, '#FFE5B4'),
-        'TOF Sensor\n(VL53L0X)': (8, 7, '#FFB4B4'),  # Red
-        'Motor Controller\n(PWM)': (2, 4, '#FFB4B4'),
-        'Servo Controller\n(PWM)': (4, 4, '#FFB4B4'),
-        'Wake Word\nDetector': (6, 5.5, '#FFE5B4'),
-        'YOLO Pose\nTracker': (8, 5.5, '#FFE5B4'),
-        'ArUco Detector': (10, 5.5, '#FFE5B4'),
-        'State Machine': (6, 3, '#B4E5FF'),  # Blue
-    }
+    # Define component positions and colors (static layout as parallel arrays)
+    names = ['Raspberry Pi', 'Camera\n(PiCamera2)', 'Microphone', 'TOF Sensor\n(VL53L0X)',
+             'Motor Controller\n(PWM)', 'Servo Controller\n(PWM)', 'Wake Word\nDetector',
+             'YOLO Pose\nTracker', 'ArUco Detector', 'State Machine']
+    xs = np.array([6, 2, 4, 8, 2, 4, 6, 8, 10, 6])
+    ys = np.array([9, 7, 7, 7, 4, 4, 5.5, 5.5, 5.5, 3])
+    # Yellow = perception/input, red = hardware, blue = computation
+    component_colors = ['#FFE5B4', '#FFE5B4', '#FFE5B4', '#FFB4B4', '#FFB4B4',
+                        '#FFB4B4', '#FFE5B4', '#FFE5B4', '#FFE5B4', '#B4E5FF']
     
     # Draw components
-    for name, (x, y, color) in components.items():
-        box = FancyBboxPatch((x-0.9, y-0.5), 1.8, 1.0,
-                             boxstyle="round,pad=0.1",
-                             facecolor=color,
-                             edgecolor='black',
-                             linewidth=2)
-        ax.add_patch(box)
+    boxes = [FancyBboxPatch((x-0.9, y-0.5), 1.8, 1.0, boxstyle="round,pad=0.1")
+             for x, y in zip(xs, ys)]
+    _add_box_collection(ax, boxes, component_colors)
+    for x, y, name in zip(xs, ys, names):
         ax.text(x, y, name, ha='center', va='center',
                 fontsize=9, fontweight='bold', wrap=True)
     
@@ -160,13 +187,18 @@ def create_system_block_diagram():
     ax.legend(handles=legend_elements, loc='upper right', fontsize=10)
     
     ax.set_title('Bin Diesel System Block Diagram', fontsize=16, fontweight='bold', pad=20)
-    plt.tight_layout()
-    plt.savefig('system_block_diagram.png', dpi=300, bbox_inches='tight')
-    print("System block diagram saved to system_block_diagram.png")
+    # dpi only applies to PNG; SVG/PDF are written as vector output with no rasterization
+    plt.savefig(output_path, dpi=300, bbox_inches='tight')  # Single layout pass (no tight_layout)
+    print(f"System block diagram saved to {output_path}")
     plt.close()
 
-def create_codebase_architecture_diagram():
+@_cached_diagram('codebase_architecture_diagram')
+def create_codebase_architecture_diagram(output_path='codebase_architecture_diagram.png'):
     """Create codebase architecture diagram with color coding"""
+    import matplotlib.pyplot as plt
+    import matplotlib.patches as mpatches
+    from matplotlib.patches import FancyBboxPatch, FancyArrowPatch
+    
     fig, ax = plt.subplots(1, 1, figsize=(14, 10))
     ax.set_xlim(0, 12)
     ax.set_ylim(0, 10)
@@ -181,69 +213,33 @@ def create_codebase_architecture_diagram():
         'config': '#95E1D3',  # Green
     }
     
-    # Main control system (YELLOW)
-    main_box = FancyBboxPatch((1, 7), 3, 1.5,
-                             boxstyle="round,pad=0.1",
-                             facecolor=colors['main'],
-                             edgecolor='black',
-                             linewidth=3)
-    ax.add_patch(main_box)
-    ax.text(2.5, 8, 'Main Control System\n(main_control_system.py)', 
-           ha='center', va='center', fontsize=10, fontweight='bold')
-    
-    # Perception modules (YELLOW/ORANGE)
-    perception_modules = [
-        ('Wake Word\nDetector', 6, 8.5),
-        ('YOLO Pose\nTracker', 8.5, 8.5),
-        ('ArUco\nDetector', 10.5, 8.5),
+    # Module layout: (name, x, y, group) - boxes are 1.4 x 0.8 centered on (x, y)
+    modules = [
+        ('Wake Word\nDetector', 6, 8.5, 'perception'),  # Perception (YELLOW/ORANGE)
+        ('YOLO Pose\nTracker', 8.5, 8.5, 'perception'),
+        ('ArUco\nDetector', 10.5, 8.5, 'perception'),
+        ('Motor\nController', 2, 5, 'hardware'),  # Hardware controllers (RED)
+        ('Servo\nController', 4, 5, 'hardware'),
+        ('TOF Sensor', 6, 5, 'hardware'),
+        ('State\nMachine', 8.5, 5, 'computation'),  # Computation modules (BLUE)
+        ('Optimizations', 10.5, 5, 'computation'),
     ]
-    for name, x, y in perception_modules:
-        box = FancyBboxPatch((x-0.7, y-0.4), 1.4, 0.8,
-                             boxstyle="round,pad=0.1",
-                             facecolor=colors['perception'],
-                             edgecolor='black',
-                             linewidth=2)
-        ax.add_patch(box)
-        ax.text(x, y, name, ha='center', va='center', fontsize=8, fontweight='bold')
     
-    # Hardware controllers (RED)
-    hardware_modules = [
-        ('Motor\nController', 2, 5),
-        ('Servo\nController', 4, 5),
-        ('TOF Sensor', 6, 5),
-    ]
-    for name, x, y in hardware_modules:
-        box = FancyBboxPatch((x-0.7, y-0.4), 1.4, 0.8,
-                             boxstyle="round,pad=0.1",
-                             facecolor=colors['hardware'],
-                             edgecolor='black',
-                             linewidth=2)
-        ax.add_patch(box)
-        ax.text(x, y, name, ha='center', va='center', fontsize=8, fontweight='bold')
+    # All boxes go into one collection: main control system (YELLOW), configuration
+    # (GREEN), then the uniformly sized modules
+    boxes = [FancyBboxPatch((1, 7), 3, 1.5, boxstyle="round,pad=0.1"),
+             FancyBboxPatch((2, 2), 2, 0.8, boxstyle="round,pad=0.1")]
+    boxes += [FancyBboxPatch((x-0.7, y-0.4), 1.4, 0.8, boxstyle="round,pad=0.1")
+              for _, x, y, _ in modules]
+    box_colors = [colors['main'], colors['config']] + [colors[group] for _, _, _, group in modules]
+    _add_box_collection(ax, boxes, box_colors, linewidths=[3] + [2] * (len(boxes) - 1))
     
-    # Computation modules (BLUE)
-    computation_modules = [
-        ('State\nMachine', 8.5, 5),
-        ('Optimizations', 10.5, 5),
-    ]
-    for name, x, y in computation_modules:
-        box = FancyBboxPatch((x-0.7, y-0.4), 1.4, 0.8,
-                             boxstyle="round,pad=0.1",
-                             facecolor=colors['computation'],
-                             edgecolor='black',
-                             linewidth=2)
-        ax.add_patch(box)
-        ax.text(x, y, name, ha='center', va='center', fontsize=8, fontweight='bold')
-    
-    # Configuration (GREEN)
-    config_box = FancyBboxPatch((2, 2), 2, 0.8,
-                                boxstyle="round,pad=0.1",
-                                facecolor=colors['config'],
-                                edgecolor='black',
-                                linewidth=2)
-    ax.add_patch(config_box)
+    ax.text(2.5, 8, 'Main Control System\n(main_control_system.py)', 
+           ha='center', va='center', fontsize=10, fontweight='bold')
     ax.text(3, 2.4, 'Configuration\n(config.py)', 
            ha='center', va='center', fontsize=9, fontweight='bold')
+    for name, x, y, _ in modules:
+        ax.text(x, y, name, ha='center', va='center', fontsize=8, fontweight='bold')
     
     # Draw connections
     connections = [
@@ -274,15 +270,38 @@ def create_codebase_architecture_diagram():
     ax.legend(handles=legend_elements, loc='lower right', fontsize=9)
     
     ax.set_title('Codebase Architecture (Color Coded)', fontsize=16, fontweight='bold', pad=20)
-    plt.tight_layout()
-    plt.savefig('codebase_architecture_diagram.png', dpi=300, bbox_inches='tight')
-    print("Codebase architecture diagram saved to codebase_architecture_diagram.png")
+    # dpi only applies to PNG; SVG/PDF are written as vector output with no rasterization
+    plt.savefig(output_path, dpi=300, bbox_inches='tight')  # Single layout pass (no tight_layout)
+    print(f"Codebase architecture diagram saved to {output_path}")
     plt.close()
 
-if __name__ == '__main__':
+DIAGRAMS = {
+    'state_machine': create_state_machine_diagram,
+    'system_block': create_system_block_diagram,
+    'architecture': create_codebase_architecture_diagram,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate diagrams for the final report')
+    parser.add_argument('diagrams', nargs='*', metavar='DIAGRAM',
+                        help=f"Diagrams to generate (default: all). Choices: {', '.join(DIAGRAMS)}")
+    parser.add_argument('--format', choices=['png', 'svg', 'pdf'], default='png',
+                        help='Output format (default: png, as included by the LaTeX report; '
+                             'svg/pdf skip rasterization)')
+    parser.add_argument('--force', action='store_true',
+                        help='Redraw diagrams even if their drawing code is unchanged')
+    args = parser.parse_args()
+    unknown = [name for name in args.diagrams if name not in DIAGRAMS]
+    if unknown:
+        parser.error(f"unknown diagram(s): {', '.join(unknown)}")
+    
     print("Generating diagrams...")
-    create_state_machine_diagram()
-    create_system_block_diagram()
-    create_codebase_architecture_diagram()
+    for name in args.diagrams or DIAGRAMS:
+        DIAGRAMS[name](force=args.force, fmt=args.format)
     print("All diagrams generated successfully!")
 
+
+if __name__ == '__main__':
+    main()
+
@@ -95,9 +95,12 @@ class HandGestureController:
     PINKY_DIP = 19
     PINKY_TIP = 20
     
+    # Finger (index, middle, ring, pinky) tip / PIP rows, used as one vectorized gather
+    FINGER_TIPS = [INDEX_TIP, MIDDLE_TIP, RING_TIP, PINKY_TIP]
+    FINGER_PIPS = [INDEX_PIP, MIDDLE_PIP, RING_PIP, PINKY_PIP]
+    
     def __init__(self, 
                  hand_model_path=None,  # Path to trained hand-keypoints model
-                 pose_model_path='yolo11n-pose.pt',  # Fallback: use pose model
                  width=640,
                  height=480,
                  confidence=0.25,
@@ -108,8 +111,7 @@ class HandGestureController:
         
         Args:
             hand_model_path: Path to YOLO model trained on hand-keypoints dataset
-                           If None, uses pose model as fallback (less accurate)
-            pose_model_path: Path to YOLO pose model (fallback if hand model not available)
+                           If None, no gestures are detected
             width: Camera width
             height: Camera height
             confidence: Detection confidence threshold (0.0-1.0)
@@ -139,30 +141,13 @@ class HandGestureController:
                         raise e1
             except Exception as e:
                 print(f"[HandGestureController] WARNING: Failed to load hand model: {e}")
-                print("[HandGestureController] Falling back to pose model")
                 self.hand_model = None
         
-        # Initialize pose model (for fallback if hand model not available)
+        # Without a hand model there are no finger keypoints, so gestures are disabled
         if not self.hand_model:
-            print(f"[HandGestureController] Using pose model (fallback mode): {pose_model_path}...")
-            print("[HandGestureController] NOTE: For better accuracy, train a hand-keypoints model:")
+            print("[HandGestureController] WARNING: No hand keypoints model - gesture detection disabled")
+            print("[HandGestureController] NOTE: Train a hand-keypoints model to enable it:")
             print("  yolo pose train data=hand-keypoints.yaml model=yolo11n-pose.pt epochs=100 imgsz=640")
-            try:
-                try:
-                    self.pose_model = YOLO(pose_model_path)
-                    print(f"[HandGestureController] Pose model loaded: {pose_model_path}")
-                except Exception as e1:
-                    # Fallback: if NCNN failed, try PyTorch
-                    if pose_model_path.endswith('_ncnn_model'):
-                        fallback_path = pose_model_path.replace('_ncnn_model', '.pt')
-                        print(f"[HandGestureController] NCNN model not found, trying PyTorch: {fallback_path}")
-                        self.pose_model = YOLO(fallback_path)
-                        print(f"[HandGestureController] PyTorch model loaded: {fallback_path}")
-                    else:
-                        raise e1
-            except Exception as e:
-                print(f"[HandGestureController] WARNING: Failed to load pose model: {e}")
-                self.pose_model = YOLO('yolo11n-pose.pt')  # Auto-download
         
         # Initialize camera (skip if sharing camera from another component)
         self.picam2 = None
@@ -211,12 +196,6 @@ class HandGestureController:
         if config.CAMERA_FLIP_VERTICAL:
             array = cv2.flip(array, 0)  # Vertical flip
         
-        # Fix color channel swap (red/blue)
-        if config.CAMERA_SWAP_RB:
-            # Swap red and blue channels: RGB -> BGR -> RGB (swaps R and B)
-            array = cv2.cvtColor(array, cv2.COLOR_RGB2BGR)
-            array = cv2.cvtColor(array, cv2.COLOR_BGR2RGB)
-        
         return array
     
     def detect_gesture_from_hand_keypoints(self, keypoints):
@@ -234,31 +213,24 @@ class HandGestureController:
         if keypoints[self.WRIST][2] < 0.4:  # Wrist not visible
             return None
         
-        # Get keypoint positions (pixel coordinates)
-        wrist = np.array([keypoints[self.WRIST][0], keypoints[self.WRIST][1]], dtype=np.float32)
-        thumb_tip = np.array([keypoints[self.THUMB_TIP][0], keypoints[self.THUMB_TIP][1]], dtype=np.float32)
-        thumb_ip = np.array([keypoints[self.THUMB_IP][0], keypoints[self.THUMB_IP][1]], dtype=np.float32)
-        index_tip = np.array([keypoints[self.INDEX_TIP][0], keypoints[self.INDEX_TIP][1]], dtype=np.float32)
-        index_pip = np.array([keypoints[self.INDEX_PIP][0], keypoints[self.INDEX_PIP][1]], dtype=np.float32)
-        middle_tip = np.array([keypoints[self.MIDDLE_TIP][0], keypoints[self.MIDDLE_TIP][1]], dtype=np.float32)
-        middle_pip = np.array([keypoints[self.MIDDLE_PIP][0], keypoints[self.MIDDLE_PIP][1]], dtype=np.float32)
-        ring_tip = np.array([keypoints[self.RING_TIP][0], keypoints[self.RING_TIP][1]], dtype=np.float32)
-        ring_pip = np.array([keypoints[self.RING_PIP][0], keypoints[self.RING_PIP][1]], dtype=np.float32)
-        pinky_tip = np.array([keypoints[self.PINKY_TIP][0], keypoints[self.PINKY_TIP][1]], dtype=np.float32)
-        pinky_pip = np.array([keypoints[self.PINKY_PIP][0], keypoints[self.PINKY_PIP][1]], dtype=np.float32)
-        
-        # Check keypoint visibility
+        # Check fingertip visibility before doing any position work
         if (keypoints[self.THUMB_TIP][2] < 0.4 or keypoints[self.INDEX_TIP][2] < 0.4 or
             keypoints[self.MIDDLE_TIP][2] < 0.4 or keypoints[self.RING_TIP][2] < 0.4 or
             keypoints[self.PINKY_TIP][2] < 0.4):
             return None
         
+        # Get keypoint positions (pixel coordinates) as one [21, 2] float32 array;
+        # per-keypoint rows below are views, not new arrays
+        xy = np.asarray(keypoints, dtype=np.float32)[:, :2]
+        wrist = xy[self.WRIST]
+        thumb_tip = xy[self.THUMB_TIP]
+        thumb_ip = xy[self.THUMB_IP]
+        
         # Check if fingers are extended upward (tip.y < pip.y means extended upward)
         # In image coordinates, Y increases downward
-        index_extended = index_tip[1] < index_pip[1] - 10  # 10 pixel threshold
-        middle_extended = middle_tip[1] < middle_pip[1] - 10
-        ring_extended = ring_tip[1] < ring_pip[1] - 10
-        pinky_extended = pinky_tip[1] < pinky_pip[1] - 10
+        # All four fingers (index, middle, ring, pinky) at once
+        finger_tips_y = xy[self.FINGER_TIPS, 1]
+        fingers_extended = finger_tips_y < xy[self.FINGER_PIPS, 1] - 10  # 10 pixel threshold
         
         # Thumb extension: check horizontal and vertical position relative to IP joint
         thumb_horizontal_dist = thumb_tip[0] - thumb_ip[0]
@@ -271,21 +243,16 @@ class HandGestureController:
         
         # Check if palm is facing camera (fingers extended upward)
         # Palm facing camera = all finger tips are above wrist
-        palm_facing_camera = (index_tip[1] < wrist[1] - 20 and 
-                             middle_tip[1] < wrist[1] - 20 and 
-                             ring_tip[1] < wrist[1] - 20 and 
-                             pinky_tip[1] < wrist[1] - 20)
+        palm_facing_camera = bool((finger_tips_y < wrist[1] - 20).all())
         
         # Gesture 1: STOP - Palm up facing camera
         # All 4 fingers (index, middle, ring, pinky) extended upward, palm facing camera
-        if (palm_facing_camera and 
-            index_extended and middle_extended and ring_extended and pinky_extended):
+        if palm_facing_camera and fingers_extended.all():
             return 'stop'
         
         # Gesture 2: THUMBS UP - Move forward
         # Thumb extended upward, other fingers closed (not extended)
-        if (thumb_points_up and 
-            not index_extended and not middle_extended and not ring_extended and not pinky_extended):
+        if thumb_points_up and not fingers_extended.any():
             return 'thumbs_up'
         
         # Gesture 3: TURN RIGHT - Thumb points right
@@ -328,20 +295,8 @@ class HandGestureController:
                     hand_keypoints = result.keypoints.data[0].cpu().numpy()  # [21, 3]
                     gesture = self.detect_gesture_from_hand_keypoints(hand_keypoints)
         
-        # Fallback to pose model if hand model not available or no hand detected
-        if gesture is None and hasattr(self, 'pose_model'):
-            results = self.pose_model(frame, conf=self.confidence, verbose=False)
-            
-            if results and len(results) > 0:
-                result = results[0]
-                
-                if result.keypoints is not None and len(result.keypoints) > 0:
-                    # Get first person's pose keypoints
-                    pose_keypoints = result.keypoints.data[0].cpu().numpy()  # [17, 3]
-                    # Note: Pose model has wrist keypoints but not detailed hand keypoints
-                    # This is a basic fallback - for best results, train a hand-keypoints model
-                    # For now, we'll just return None if hand model isn't available
-                    pass
+        # No pose-model fallback: pose has no finger keypoints, so without the hand model
+        # there is no gesture to derive
         
         if gesture is None:
             # Reset gesture tracking
@@ -420,11 +375,9 @@ if __name__ == '__main__':
     print()
     
     try:
-        # Try to use hand keypoints model if available
-        # Otherwise falls back to pose model (less accurate for hand gestures)
+        # Gestures need a trained hand keypoints model
         controller = HandGestureController(
-            hand_model_path=None,  # Set to path of trained hand-keypoints model if available
-            pose_model_path='yolo11n-pose.pt',  # Fallback model
+            hand_model_path=None,  # Set to path of trained hand-keypoints model
             width=config.CAMERA_WIDTH,
             height=config.CAMERA_HEIGHT,
             confidence=config.YOLO_CONFIDENCE,
@@ -9,8 +9,58 @@ import cv2
 import numpy as np
 from logger import setup_logger, log_error
 
+# Optional: numba JIT for the per-pixel red test (falls back to the numpy path)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 logger = setup_logger(__name__)
 
+# Red color thresholds in HSV terms (red wraps around 0/180)
+# Balanced ranges: catch shadowed reds but reject false positives
+_RED_HUE_TOLERANCE = 15  # Hue 0-15 or 165-180 (OpenCV hue units, 2 deg each)
+_RED_MIN_SATURATION = 70
+_RED_MIN_VALUE = 85  # Increased value to 85 to capture more red
+# Cross-multiplied forms used by check_color_match_red (computed once, not per call)
+_RED_SAT_COEFF = 2 * _RED_MIN_SATURATION - 1
+_RED_HUE_COEFF = 2 * _RED_HUE_TOLERANCE + 1
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _count_red_pixels(roi):
+        """Count red pixels in a BGR ROI in one pass, no mask array (same test as the numpy path)"""
+        count = 0
+        for i in range(roi.shape[0]):
+            for j in range(roi.shape[1]):
+                b = np.int32(roi[i, j, 0])
+                g = np.int32(roi[i, j, 1])
+                r = np.int32(roi[i, j, 2])
+                chroma = r - min(g, b)
+                if (r >= _RED_MIN_VALUE
+                        and 510 * chroma >= _RED_SAT_COEFF * r
+                        and 60 * abs(g - b) < _RED_HUE_COEFF * chroma):
+                    count += 1
+        return count
+
+# draw_overlay text settings
+_OVERLAY_FONT = cv2.FONT_HERSHEY_SIMPLEX
+_OVERLAY_FONT_SCALE = 0.6
+_OVERLAY_TEXT_THICKNESS = 2
+_OVERLAY_LABEL = "RED SQUARE DETECTED"
+_OVERLAY_MAX_ASPECT = 99.99  # Printed aspect ratio is clamped so it fits the measured box
+# Text box size measured once: Hershey text height does not depend on the string, and
+# all digits share one width, so the widest possible value of each line sets the width
+_OVERLAY_TEXT_W = max(
+    cv2.getTextSize(text, _OVERLAY_FONT, _OVERLAY_FONT_SCALE, _OVERLAY_TEXT_THICKNESS)[0][0]
+    for text in (_OVERLAY_LABEL, "Conf: 0.00", "Color Match: 100.0%",
+                 f"Aspect Ratio: {_OVERLAY_MAX_ASPECT:.2f}")
+)
+_OVERLAY_TEXT_H = cv2.getTextSize(_OVERLAY_LABEL, _OVERLAY_FONT, _OVERLAY_FONT_SCALE,
+                                  _OVERLAY_TEXT_THICKNESS)[0][1]
+
 
 def check_color_match_red(frame, bbox):
     """
@@ -40,70 +90,93 @@ def check_color_match_red(frame, bbox):
     if roi.size == 0:
         return 0.0
     
-    # Convert BGR to HSV for better color detection
-    hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
-    
-    # Red color ranges in HSV (red wraps around 0/180)
-    # Balanced ranges: catch shadowed reds but reject false positives
-    # Lower red range (0-15) - high saturation, moderate-high value
-    lower_red1 = np.array([0, 70, 85])  # Increased value to 85 to capture more red
-    upper_red1 = np.array([15, 255, 255])
-    # Upper red range (165-180)
-    lower_red2 = np.array([165, 70, 85])  # Increased value to 85
-    upper_red2 = np.array([180, 255, 255])
-    
-    # Blue color range in HSV (for exclusion - hue around 100-130)
-    # We'll use this to explicitly exclude blue objects
-    lower_blue = np.array([100, 50, 50])
-    upper_blue = np.array([130, 255, 255])
+    # Large boxes: sample every 2nd pixel in each direction (strided view, no copy).
+    # The match ratio is a statistic - 1/4 of the pixels gives the same answer
+    # for a box this size at a quarter of the work
+    if (y2 - y1) * (x2 - x1) > 2500:
+        roi = roi[::2, ::2]
     
-    # Create mask for red color
-    mask_red1 = cv2.inRange(hsv, lower_red1, upper_red1)
-    mask_red2 = cv2.inRange(hsv, lower_red2, upper_red2)
-    mask_red = mask_red1 + mask_red2
+    if NUMBA_AVAILABLE:
+        # JIT path: a single pass over the ROI view, no int32 copy or mask
+        return _count_red_pixels(roi) / roi[..., 0].size
     
-    # Create mask for blue color (to exclude it)
-    mask_blue = cv2.inRange(hsv, lower_blue, upper_blue)
-    
-    # Red mask minus blue mask (exclude blue pixels from red detection)
-    mask = cv2.bitwise_and(mask_red, cv2.bitwise_not(mask_blue))
+    # Apply the HSV test directly on BGR in one vectorized pass (no cvtColor, no
+    # per-range inRange). With R the largest channel:
+    #   V = R, S = 255 * (R - min(G, B)) / R, |H| = 30 * |G - B| / (R - min(G, B))
+    # The inequalities below are those bounds cross-multiplied, so the mask matches the
+    # cvtColor + inRange version up to OpenCV's integer rounding of H/S at the thresholds
+    # (blue hues 100-130 never pass, so no separate blue exclusion is needed)
+    roi = roi.astype(np.int32)
+    b, g, r = roi[..., 0], roi[..., 1], roi[..., 2]
+    chroma = r - np.minimum(g, b)
+    mask = ((r >= _RED_MIN_VALUE)
+            & (510 * chroma >= _RED_SAT_COEFF * r)
+            & (60 * np.abs(g - b) < _RED_HUE_COEFF * chroma))
     
     # Calculate percentage of pixels matching red color
     total_pixels = mask.size
-    matching_pixels = np.count_nonzero(mask)
+    matching_pixels = cv2.countNonZero(mask.view(np.uint8))  # bool -> uint8 view, no copy
     color_match_ratio = matching_pixels / total_pixels if total_pixels > 0 else 0.0
     
     return color_match_ratio
 
 
-def detect_red_box(yolo_model, frame, confidence_threshold=0.3, color_threshold=0.18, square_aspect_ratio_tolerance=0.55):
+def run_yolo(yolo_model, frame_rgb, confidence_threshold=0.3, imgsz=None):
     """
-    Detect red square object using YOLO object detection + OpenCV color tracking
-    Uses YOLO to get bounding boxes (ignores labels), checks for red color and square dimensions
+    Run a single YOLO forward pass on a frame
     
     Args:
         yolo_model: YOLO model instance
-        frame: BGR frame from camera (OpenCV format) - will be converted to RGB for YOLO
+        frame_rgb: RGB frame (YOLO expects RGB)
         confidence_threshold: Minimum YOLO confidence (default: 0.3)
+        imgsz: Optional (height, width) inference size - pass the frame's own size
+               (multiples of 32) so YOLO doesn't letterbox/pad the frame
+        
+    Returns:
+        YOLO result object for the frame, or None if YOLO returned nothing
+    """
+    kwargs = {'imgsz': imgsz} if imgsz is not None else {}
+    results = yolo_model(
+        frame_rgb,
+        conf=confidence_threshold,
+        verbose=False,
+        **kwargs
+    )
+    return results[0] if results else None
+
+
+def warmup_yolo(yolo_model, height, width, imgsz=None):
+    """
+    Run one dummy inference so the first real frame doesn't pay for lazy model setup
+    (graph/NCNN plan construction and buffer allocation - can be 0.5-2s on a Pi)
+    
+    Args:
+        yolo_model: YOLO model instance
+        height, width: Frame size that will be fed to the model
+        imgsz: Same imgsz the real calls will use (see run_yolo())
+    """
+    try:
+        run_yolo(yolo_model, np.zeros((height, width, 3), dtype=np.uint8), imgsz=imgsz)
+    except Exception as e:
+        logger.warning(f"YOLO warmup failed: {e}")
+
+
+def pick_red_box(result, frame, color_threshold=0.18, square_aspect_ratio_tolerance=0.55):
+    """
+    Pick the best red square out of an existing YOLO result
+    Uses YOLO bounding boxes only (ignores labels), checks for red color and square dimensions
+    
+    Args:
+        result: YOLO result object from run_yolo() (or None)
+        frame: BGR frame (OpenCV format) the result was computed on
         color_threshold: Minimum color match ratio (default: 0.18 = 18%)
         square_aspect_ratio_tolerance: Tolerance for square shape (default: 0.55 = 55%)
-                                      Aspect ratio must be between (1.0 - tolerance) and (1.0 + tolerance)
-                                      e.g., 0.55 means aspect ratio between 0.45 and 1.55
         
     Returns:
-        dict with marker info: {
-            'detected': bool,
-            'center_x': int,
-            'center_y': int,
-            'width': int,
-            'height': int,
-            'area': int,
-            'confidence': float,
-            'color_match': float,
-            'aspect_ratio': float
-        }
+        dict with marker info (same format as detect_red_box())
     """
-    if yolo_model is None:
+    # Check if we have any detections
+    if result is None or result.boxes is None or len(result.boxes) == 0:
         return {
             'detected': False,
             'center_x': None,
@@ -116,140 +189,142 @@ def detect_red_box(yolo_model, frame, confidence_threshold=0.3, color_threshold=
             'aspect_ratio': None
         }
     
-    try:
-        # Convert BGR to RGB for YOLO (YOLO expects RGB)
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
-        # Run YOLO object detection (we use it only for bounding boxes, not labels)
-        results = yolo_model(
-            frame_rgb,
-            conf=confidence_threshold,
-            verbose=False
-        )
-        
-        if not results or len(results) == 0:
-            return {
-                'detected': False,
-                'center_x': None,
-                'center_y': None,
-                'width': None,
-                'height': None,
-                'area': None,
-                'confidence': None,
-                'color_match': None,
-                'aspect_ratio': None
-            }
-        
-        result = results[0]
+    # Look for any object that:
+    # 1. Has roughly square dimensions (aspect ratio close to 1.0)
+    # 2. Contains red color
+    # (We ignore YOLO labels since they're inaccurate)
+    best_detection = None
+    best_score = 0.0  # Combined score: confidence * color_match * square_score
+    
+    # Pull all boxes off the device once (one host sync per frame, not one per box)
+    # and run the cheap size/shape filtering on the whole array
+    xyxy = result.boxes.xyxy.cpu().numpy().astype(np.int32)
+    confidences = result.boxes.conf.cpu().numpy()
+    widths = xyxy[:, 2] - xyxy[:, 0]
+    heights = xyxy[:, 3] - xyxy[:, 1]
+    
+    # Skip if bounding box is too small
+    keep = (widths >= 15) & (heights >= 15)
+    
+    # Calculate aspect ratio (width/height)
+    # For square: aspect_ratio should be close to 1.0
+    aspect_ratios = widths / np.maximum(heights, 1)
+    
+    # Check if roughly square (aspect ratio between (1.0 - tolerance) and (1.0 + tolerance))
+    min_aspect = 1.0 - square_aspect_ratio_tolerance
+    max_aspect = 1.0 + square_aspect_ratio_tolerance
+    keep &= (aspect_ratios >= min_aspect) & (aspect_ratios <= max_aspect)
+    
+    # Calculate square score (how close to perfect square, 1.0 = perfect square)
+    square_scores = np.clip(1.0 - np.abs(1.0 - aspect_ratios) / square_aspect_ratio_tolerance, 0.0, 1.0)
+    
+    # Calculate area (proxy for distance/size)
+    areas = widths * heights
+    
+    # Color match is at most 1.0, so this is the best priority each box could reach.
+    # Visit boxes best-bound first: once a bound can't beat the current best, stop
+    upper_bounds = (areas * 0.7) + (confidences * square_scores * 0.3)
+    candidates = np.flatnonzero(keep)
+    candidates = candidates[np.argsort(-upper_bounds[candidates], kind='stable')]
+    
+    for i in candidates:
+        if upper_bounds[i] <= best_score:
+            break
         
-        # Check if we have any detections
-        if result.boxes is None or len(result.boxes) == 0:
-            return {
-                'detected': False,
-                'center_x': None,
-                'center_y': None,
-                'width': None,
-                'height': None,
-                'area': None,
-                'confidence': None,
-                'color_match': None,
-                'aspect_ratio': None
-            }
+        x1, y1, x2, y2 = (int(v) for v in xyxy[i])
+        width, height, area = int(widths[i]), int(heights[i]), int(areas[i])
+        confidence = float(confidences[i])
+        aspect_ratio = float(aspect_ratios[i])
+        square_score = float(square_scores[i])
         
-        # Look for any object that:
-        # 1. Has roughly square dimensions (aspect ratio close to 1.0)
-        # 2. Contains red color
-        # (We ignore YOLO labels since they're inaccurate)
-        best_detection = None
-        best_score = 0.0  # Combined score: confidence * color_match * square_score
+        # Check color match using OpenCV (hardcoded for red)
+        color_match_ratio = check_color_match_red(frame, (x1, y1, x2, y2))
         
-        for box in result.boxes:
-            confidence = float(box.conf[0])
-            
-            # Get bounding box coordinates
-            x1, y1, x2, y2 = map(int, box.xyxy[0].cpu().numpy())
-            width = x2 - x1
-            height = y2 - y1
-            
-            # Skip if bounding box is too small
-            if width < 15 or height < 15:
-                continue
+        # Object must match red color threshold
+        if color_match_ratio >= color_threshold:
+            # Prioritize by area first (closest/largest object)
+            # Then use combined score as tiebreaker
+            # This prevents background posters from being selected over the cube in front
+            combined_score = confidence * color_match_ratio * square_score
+            priority_score = (area * 0.7) + (combined_score * 0.3)  # 70% area, 30% quality
             
-            # Calculate aspect ratio (width/height)
-            # For square: aspect_ratio should be close to 1.0
-            aspect_ratio = width / height if height > 0 else 0.0
-            
-            # Check if roughly square (aspect ratio between (1.0 - tolerance) and (1.0 + tolerance))
-            min_aspect = 1.0 - square_aspect_ratio_tolerance
-            max_aspect = 1.0 + square_aspect_ratio_tolerance
-            is_square = min_aspect <= aspect_ratio <= max_aspect
-            
-            if not is_square:
-                continue  # Skip non-square objects
-            
-            # Check color match using OpenCV (hardcoded for red)
-            color_match_ratio = check_color_match_red(frame, (x1, y1, x2, y2))
-            
-            # Object must match red color threshold
-            if color_match_ratio >= color_threshold:
-                # Calculate square score (how close to perfect square, 1.0 = perfect square)
-                square_score = 1.0 - abs(1.0 - aspect_ratio) / square_aspect_ratio_tolerance
-                square_score = max(0.0, min(1.0, square_score))  # Clamp between 0 and 1
+            if priority_score > best_score:
+                best_score = priority_score
+                center_x = (x1 + x2) // 2
+                center_y = (y1 + y2) // 2
                 
-                # Calculate area (proxy for distance/size)
-                area = width * height
-                
-                # Prioritize by area first (closest/largest object)
-                # Then use combined score as tiebreaker
-                # This prevents background posters from being selected over the cube in front
-                combined_score = confidence * color_match_ratio * square_score
-                priority_score = (area * 0.7) + (combined_score * 0.3)  # 70% area, 30% quality
-                
-                if priority_score > best_score:
-                    best_score = priority_score
-                    center_x = (x1 + x2) // 2
-                    center_y = (y1 + y2) // 2
-                    
-                    best_detection = {
-                        'detected': True,
-                        'center_x': center_x,
-                        'center_y': center_y,
-                        'width': width,
-                        'height': height,
-                        'area': area,
-                        'confidence': confidence,
-                        'color_match': color_match_ratio,
-                        'aspect_ratio': aspect_ratio
-                    }
+                best_detection = {
+                    'detected': True,
+                    'center_x': center_x,
+                    'center_y': center_y,
+                    'width': width,
+                    'height': height,
+                    'area': area,
+                    'confidence': confidence,
+                    'color_match': color_match_ratio,
+                    'aspect_ratio': aspect_ratio
+                }
+    
+    if best_detection:
+        return best_detection
+    return {
+        'detected': False,
+        'center_x': None,
+        'center_y': None,
+        'width': None,
+        'height': None,
+        'area': None,
+        'confidence': None,
+        'color_match': None,
+        'aspect_ratio': None
+    }
+
+
+def detect_red_box(yolo_model, frame, confidence_threshold=0.3, color_threshold=0.18, square_aspect_ratio_tolerance=0.55,
+                   yolo_result=None, imgsz=None, frame_rgb=None):
+    """
+    Detect red square object using YOLO object detection + OpenCV color tracking
+    Convenience wrapper: run_yolo() followed by pick_red_box()
+    
+    Args:
+        yolo_model: YOLO model instance (unused when yolo_result is given)
+        frame: BGR frame from camera (OpenCV format) - will be converted to RGB for YOLO
+        confidence_threshold: Minimum YOLO confidence (default: 0.3)
+        color_threshold: Minimum color match ratio (default: 0.18 = 18%)
+        square_aspect_ratio_tolerance: Tolerance for square shape (default: 0.55 = 55%)
+                                      Aspect ratio must be between (1.0 - tolerance) and (1.0 + tolerance)
+                                      e.g., 0.55 means aspect ratio between 0.45 and 1.55
+        yolo_result: Optional YOLO result already computed for this frame (e.g. one
+                     that is also used for drawing) - skips running YOLO again
+        imgsz: Optional (height, width) inference size, passed to run_yolo()
+        frame_rgb: Optional RGB version of frame the caller already has - YOLO runs on it
+                   directly instead of converting frame back from BGR
         
-        if best_detection:
-            return best_detection
-        else:
-            return {
-                'detected': False,
-                'center_x': None,
-                'center_y': None,
-                'width': None,
-                'height': None,
-                'area': None,
-                'confidence': None,
-                'color_match': None,
-                'aspect_ratio': None
-            }
+    Returns:
+        dict with marker info: {
+            'detected': bool,
+            'center_x': int,
+            'center_y': int,
+            'width': int,
+            'height': int,
+            'area': int,
+            'confidence': float,
+            'color_match': float,
+            'aspect_ratio': float
+        }
+    """
+    try:
+        result = yolo_result
+        if result is None and yolo_model is not None:
+            # Convert BGR to RGB for YOLO (YOLO expects RGB), unless the caller passed it in
+            if frame_rgb is None:
+                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            result = run_yolo(yolo_model, frame_rgb, confidence_threshold, imgsz=imgsz)
+        return pick_red_box(result, frame, color_threshold, square_aspect_ratio_tolerance)
                 
     except Exception as e:
         log_error(logger, e, "Error in red box detection")
-        return {
-            'detected': False,
-            'center_x': None,
-            'center_y': None,
-            'width': None,
-            'height': None,
-            'area': None,
-            'confidence': None,
-            'color_match': None,
-            'aspect_ratio': None
-        }
+        return pick_red_box(None, frame)
 
 
 def draw_overlay(frame, marker, yolo_result=None):
@@ -264,16 +339,17 @@ def draw_overlay(frame, marker, yolo_result=None):
     Returns:
         Annotated frame in BGR format
     """
-    # Frame is already in BGR format
-    annotated_frame = frame.copy()
-    
-    # Use YOLO's built-in plot() if available for default overlays
+    # Use YOLO's built-in plot() if available for default overlays - it returns a new
+    # BGR image, so the frame only needs copying when plot() isn't used
+    annotated_frame = None
     if yolo_result is not None:
         try:
             annotated_frame = yolo_result.plot()  # YOLO's default overlay (returns BGR)
         except Exception as e:
             logger.warning(f"YOLO plot() failed: {e}, using frame as-is")
-            # Frame is already BGR, no conversion needed
+    if annotated_frame is None:
+        # Frame is already BGR, no conversion needed
+        annotated_frame = frame.copy()
     
     # Draw red box detection overlay
     if marker['detected']:
@@ -292,21 +368,18 @@ def draw_overlay(frame, marker, yolo_result=None):
         cv2.circle(annotated_frame, (marker['center_x'], marker['center_y']), 5, color, -1)
         
         # Draw label with detection info
-        label = "RED SQUARE DETECTED"
+        label = _OVERLAY_LABEL
         conf_text = f"Conf: {marker['confidence']:.2f}"
         color_text = f"Color Match: {marker['color_match']:.1%}"
-        aspect_text = f"Aspect Ratio: {marker.get('aspect_ratio', 0):.2f}"
+        aspect_text = f"Aspect Ratio: {min(marker.get('aspect_ratio', 0), _OVERLAY_MAX_ASPECT):.2f}"
         
         # Background for text (for better visibility)
-        font = cv2.FONT_HERSHEY_SIMPLEX
-        font_scale = 0.6
-        thickness_text = 2
+        font = _OVERLAY_FONT
+        font_scale = _OVERLAY_FONT_SCALE
+        thickness_text = _OVERLAY_TEXT_THICKNESS
         
-        # Calculate text size
-        (label_w, label_h), _ = cv2.getTextSize(label, font, font_scale, thickness_text)
-        (conf_w, conf_h), _ = cv2.getTextSize(conf_text, font, font_scale, thickness_text)
-        (color_w, color_h), _ = cv2.getTextSize(color_text, font, font_scale, thickness_text)
-        (aspect_w, aspect_h), _ = cv2.getTextSize(aspect_text, font, font_scale, thickness_text)
+        # Text size is measured once at import (no getTextSize per frame)
+        text_w, text_h = _OVERLAY_TEXT_W, _OVERLAY_TEXT_H
         
         # Draw text background
         text_x = x1
@@ -315,18 +388,18 @@ def draw_overlay(frame, marker, yolo_result=None):
             text_y = y2 + 40
         
         cv2.rectangle(annotated_frame, 
-                     (text_x - 5, text_y - label_h - 5),
-                     (text_x + max(label_w, conf_w, color_w, aspect_w) + 5, text_y + conf_h + color_h + aspect_h + 15),
+                     (text_x - 5, text_y - text_h - 5),
+                     (text_x + text_w + 5, text_y + 3 * text_h + 15),
                      (0, 0, 0), -1)
         
         # Draw text
         cv2.putText(annotated_frame, label, (text_x, text_y),
                    font, font_scale, color, thickness_text)
-        cv2.putText(annotated_frame, conf_text, (text_x, text_y + conf_h + 5),
+        cv2.putText(annotated_frame, conf_text, (text_x, text_y + text_h + 5),
                    font, font_scale, color, thickness_text)
-        cv2.putText(annotated_frame, color_text, (text_x, text_y + conf_h + color_h + 10),
+        cv2.putText(annotated_frame, color_text, (text_x, text_y + 2 * text_h + 10),
                    font, font_scale, color, thickness_text)
-        cv2.putText(annotated_frame, aspect_text, (text_x, text_y + conf_h + color_h + aspect_h + 15),
+        cv2.putText(annotated_frame, aspect_text, (text_x, text_y + 3 * text_h + 15),
                    font, font_scale, color, thickness_text)
         
         # Draw status at top
@@ -354,7 +427,7 @@ def main():
     
     try:
         import config
-        from picamera2 import Picamera2
+        from picamera2 import Picamera2, MappedArray
         from ultralytics import YOLO
     except ImportError as e:
         print(f"ERROR: Missing required module: {e}")
@@ -411,50 +484,69 @@ def main():
     print(f"[TEST] Camera started: {config.CAMERA_WIDTH}x{config.CAMERA_HEIGHT}")
     print()
     
+    # Fold rotation and flips into one rotate + one flip, worked out once up front
+    # 180 deg rotation == flipping both axes, and flips commute, so 0/180 with any
+    # flips collapses to a single cv2.flip (or nothing)
+    flip_h = bool(config.CAMERA_FLIP_HORIZONTAL)
+    flip_v = bool(config.CAMERA_FLIP_VERTICAL)
+    rotate_code = None
+    if config.CAMERA_ROTATION == 180:
+        flip_h, flip_v = not flip_h, not flip_v
+    elif config.CAMERA_ROTATION == 90:
+        rotate_code = cv2.ROTATE_90_CLOCKWISE
+    elif config.CAMERA_ROTATION == 270:
+        rotate_code = cv2.ROTATE_90_COUNTERCLOCKWISE
+    flip_code = {(True, False): 1, (False, True): 0, (True, True): -1}.get((flip_h, flip_v))
+    
+    # Preallocated frame buffers, reused every frame instead of a fresh ~900 KB array
+    # per capture / rotate / flip / color conversion
+    cam_shape = (config.CAMERA_HEIGHT, config.CAMERA_WIDTH, 3)
+    out_shape = cam_shape if rotate_code is None else (cam_shape[1], cam_shape[0], 3)
+    rotate_buf = np.empty(out_shape, dtype=np.uint8) if rotate_code is not None and flip_code is not None else None
+    frame = np.empty(out_shape, dtype=np.uint8)
+    frame_bgr = np.empty(out_shape, dtype=np.uint8)
+    
+    # Run YOLO at the frame's own size (rounded up to the model stride of 32) so no
+    # letterbox resize/pad happens per frame (NCNN models otherwise pad 640x480 to 640x640)
+    inference_size = tuple(-(-dim // 32) * 32 for dim in out_shape[:2])
+    
+    # Warm up YOLO at that size so the first frame doesn't stall
+    print("[TEST] Warming up YOLO model...")
+    warmup_yolo(yolo_model, out_shape[0], out_shape[1], imgsz=inference_size)
+    
     # FPS tracking
     frame_count = 0
     start_time = time.time()
     
     try:
         while True:
-            # Get frame
-            frame = picam2.capture_array(wait=True)  # Returns RGB
-            
-            # Apply camera rotation if configured
-            if config.CAMERA_ROTATION == 180:
-                frame = cv2.rotate(frame, cv2.ROTATE_180)
-            elif config.CAMERA_ROTATION == 90:
-                frame = cv2.rotate(frame, cv2.ROTATE_90_CLOCKWISE)
-            elif config.CAMERA_ROTATION == 270:
-                frame = cv2.rotate(frame, cv2.ROTATE_90_COUNTERCLOCKWISE)
+            # Get frame: read the camera buffer in place (zero-copy view) and write the
+            # rotated/flipped result straight into the preallocated frame (RGB)
+            request = picam2.capture_request()
+            try:
+                with MappedArray(request, "main") as mapped:
+                    if rotate_code is not None and flip_code is not None:
+                        cv2.rotate(mapped.array, rotate_code, dst=rotate_buf)
+                        cv2.flip(rotate_buf, flip_code, dst=frame)
+                    elif rotate_code is not None:
+                        cv2.rotate(mapped.array, rotate_code, dst=frame)
+                    elif flip_code is not None:
+                        cv2.flip(mapped.array, flip_code, dst=frame)
+                    else:
+                        np.copyto(frame, mapped.array)
+            finally:
+                request.release()
             
-            # Apply flips if configured
-            if config.CAMERA_FLIP_HORIZONTAL:
-                frame = cv2.flip(frame, 1)
-            if config.CAMERA_FLIP_VERTICAL:
-                frame = cv2.flip(frame, 0)
-            
-            # Fix color channel swap if needed
-            if config.CAMERA_SWAP_RB:
-                frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            # Run YOLO detection to get result object for overlay
-            yolo_results = yolo_model(
-                frame,
-                conf=args.confidence,
-                verbose=False
-            )
-            yolo_result = yolo_results[0] if yolo_results else None
+            # Run YOLO once per frame - the same result feeds detection and overlay
+            yolo_result = run_yolo(yolo_model, frame, args.confidence, imgsz=inference_size)
             
-            # Convert RGB to BGR for color detection (detect_red_box expects BGR)
-            frame_bgr = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+            # Convert RGB to BGR for color detection (pick_red_box expects BGR)
+            cv2.cvtColor(frame, cv2.COLOR_RGB2BGR, dst=frame_bgr)
             
             # Detect red square
-            marker = detect_red_box(
-                yolo_model,
+            marker = pick_red_box(
+                yolo_result,
                 frame_bgr,
-                confidence_threshold=args.confidence,
                 color_threshold=args.color_threshold,
                 square_aspect_ratio_tolerance=args.square_tolerance
             )
@@ -24,8 +24,8 @@ from tof_sensor import ToFSensor
 # from voice_recognizer import VoiceRecognizer  # COMMENTED OUT - no voice commands
 # from hand_gesture_controller import HandGestureController, get_gesture_command
 from logger import setup_logger, log_error, log_warning, log_info, log_debug
-from optimizations import FrameCache, PerformanceMonitor, conditional_log, skip_frames
-from home_marker_detector import detect_red_box
+from optimizations import FrameCache, PerformanceMonitor, LoopRateLimiter, conditional_log, skip_frames
+from home_marker_detector import detect_red_box, warmup_yolo
 
 
 class BinDieselSystem:
@@ -105,6 +105,8 @@ class BinDieselSystem:
                     log_info(self.logger, f"PyTorch model loaded: {fallback_path}")
                 else:
                     raise e1
+            # Warm up now so the first HOME-state frame doesn't stall the control loop
+            warmup_yolo(self.home_marker_model, config.CAMERA_HEIGHT, config.CAMERA_WIDTH)
         except Exception as e:
             log_warning(self.logger, f"Failed to initialize YOLO object detection: {e}", "Home marker detection will not work")
             self.home_marker_model = None
@@ -167,6 +169,7 @@ class BinDieselSystem:
         # Performance optimizations
         self.frame_cache = FrameCache(max_age=0.05)  # Cache frames for 50ms
         self.performance_monitor = PerformanceMonitor()
+        self.loop_rate = LoopRateLimiter(getattr(config, 'CONTROL_LOOP_PERIOD', 0.01))
         self.frame_count = 0
         self.cached_visual_result = None  # Cache visual detection results
         self.cached_visual_timestamp = 0
@@ -247,7 +250,6 @@ class BinDieselSystem:
     #     try:
     #         self.gesture_controller = HandGestureController(
     #             hand_model_path=config.YOLO_HAND_MODEL,  # Use trained hand-keypoints model if available
-    #             pose_model_path=config.YOLO_POSE_MODEL,  # Fallback to pose model
     #             width=config.CAMERA_WIDTH,
     #             height=config.CAMERA_HEIGHT,
     #             confidence=config.YOLO_CONFIDENCE,
@@ -265,6 +267,11 @@ class BinDieselSystem:
     ##############################################################################################################################
     def handle_idle_state(self):
         """Handle IDLE state - wake word only, no voice recognizer (exclusive mic access)"""
+        # Vision isn't used while waiting for the wake word - pause the camera stream
+        # (no-op if already paused; the next get_frame() resumes it)
+        if self.visual:
+            self.visual.pause()
+        
         # Clean up voice recognizer - COMMENTED OUT (no voice commands)
         # if self._voice_initialized and self.voice:
         #     try:
@@ -436,6 +443,20 @@ class BinDieselSystem:
             self.motor.forward(config.MOTOR_FAST) 
             self.sm.transition_to(State.TRACKING_USER)
         
+        # Check TOF before any vision work: when the user is reached there's no point
+        # spending a YOLO inference first (it only delays the stop by one frame)
+        # Guard TOF usage: ensure sensor exists and emergency stop is enabled
+        if getattr(self, 'tof', None) and config.EMERGENCY_STOP_ENABLED:
+            try:
+                if self.tof.detect():
+                    print("[Main] User reached (TOF sensor), stopping -------------------")
+                    self.motor.stop()
+                    self.servo.center()
+                    self._transition_to(State.STOPPED)
+                    return
+            except Exception as e:
+                conditional_log(self.logger, 'debug', f"TOF detection error in FOLLOWING_USER: {e}", config.DEBUG_TOF)
+        
         # Update visual detection (use cached if available)
         current_time = time.time()
         
@@ -478,18 +499,6 @@ class BinDieselSystem:
             self._transition_to(State.TRACKING_USER)
             return
         
-        # Guard TOF usage: ensure sensor exists and emergency stop is enabled
-        if getattr(self, 'tof', None) and config.EMERGENCY_STOP_ENABLED:
-            try:
-                if self.tof.detect():
-                    print("[Main] User reached (TOF sensor), stopping -------------------")
-                    self.motor.stop()
-                    self.servo.center()
-                    self._transition_to(State.STOPPED)
-                    return
-            except Exception as e:
-                conditional_log(self.logger, 'debug', f"TOF detection error in FOLLOWING_USER: {e}", config.DEBUG_TOF)
-        
         # Calculate steering based on angle
         if result['angle'] is not None:
             angle = result['angle']
@@ -909,8 +918,9 @@ class BinDieselSystem:
                                   f"(min={stats['fps_min']:.1f}, max={stats['fps_max']:.1f})",
                                   config.DEBUG_MODE)
                 
-                # Small delay to prevent CPU spinning
-                time.sleep(0.01)
+                # Pace the loop to a fixed period (prevents CPU spinning without
+                # adding a fixed delay on top of slow iterations)
+                self.loop_rate.wait()
         
         except KeyboardInterrupt:
             log_info(self.logger, "Interrupted by user")
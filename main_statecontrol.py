@@ -23,8 +23,8 @@ from motor_controller import MotorController
 from servo_controller import ServoController
 from tof_sensor import ToFSensor
 from logger import setup_logger, log_error, log_warning, log_info, log_debug
-from optimizations import FrameCache, PerformanceMonitor, conditional_log, skip_frames
-from home_marker_detector import detect_red_box
+from optimizations import FrameCache, PerformanceMonitor, LoopRateLimiter, conditional_log, skip_frames
+from home_marker_detector import detect_red_box, warmup_yolo
 
 
 class BinDieselSystem:
@@ -152,6 +152,8 @@ class BinDieselSystem:
                     log_info(self.logger, f"PyTorch model loaded: {fallback_path}")
                 else:
                     raise e1
+            # Warm up now so the first HOME-state frame doesn't stall the control loop
+            warmup_yolo(self.home_marker_model, config.CAMERA_HEIGHT, config.CAMERA_WIDTH)
         except Exception as e:
             log_warning(self.logger, f"Failed to initialize YOLO object detection: {e}", "Home marker detection will not work")
             self.home_marker_model = None
@@ -165,6 +167,17 @@ class BinDieselSystem:
         # Performance optimizations
         self.frame_cache = FrameCache(max_age=0.05)  # Cache frames for 50ms
         self.performance_monitor = PerformanceMonitor()
+        self.loop_rate = LoopRateLimiter(getattr(config, 'CONTROL_LOOP_PERIOD', 0.01))
+        
+        # State -> handler dispatch table, built once (run() does one dict lookup per
+        # tick instead of an if/elif chain of enum comparisons)
+        self._state_handlers = {
+            State.IDLE: self.handle_idle_state,
+            State.TRACKING_USER: self.handle_tracking_user_state,
+            State.FOLLOWING_USER: self.handle_following_user_state,
+            State.STOPPED: self.handle_stopped_state,
+            State.HOME: self.handle_home_state,
+        }
         self.frame_count = 0
         self.cached_visual_result = None  # Cache visual detection results
         self.cached_visual_timestamp = 0
@@ -220,6 +233,11 @@ class BinDieselSystem:
     ##############################################################################################################################
     def handle_idle_state(self):
         """Handle IDLE state - wake word only, no voice recognizer (exclusive mic access)"""
+        # Vision isn't used while waiting for the wake word - pause the camera stream
+        # (no-op if already paused; the next get_frame() resumes it)
+        if self.visual:
+            self.visual.pause()
+        
   
         # Ensure wake word detector is running
         if self._wake_word_stopped: 
@@ -512,6 +530,7 @@ class BinDieselSystem:
                 if self.tof and self.tof.detect() and state != State.IDLE and state != State.STOPPED:   
                     if state == State.HOME: 
                         log_info(self.logger, "TRYING TO TURN, PLEASE MOVE AWAY FROM BIN DIESEL")
+                        self.loop_rate.wait()  # Don't busy-spin while blocked
                         continue  # Skip all other processing this frame
                     log_info(self.logger, "=" * 70)
                     log_info(self.logger, "EMERGENCY STOP: TOF sensor triggered!")
@@ -535,20 +554,9 @@ class BinDieselSystem:
                 
             
                 # Route to appropriate handler based on state
-                if state == State.IDLE:
-                    self.handle_idle_state()
-                
-                elif state == State.TRACKING_USER:
-                    self.handle_tracking_user_state()
-                
-                elif state == State.FOLLOWING_USER:
-                    self.handle_following_user_state()
-                
-                elif state == State.STOPPED:
-                    self.handle_stopped_state()
-                
-                elif state == State.HOME:
-                    self.handle_home_state()
+                handler = self._state_handlers.get(state)
+                if handler is not None:
+                    handler()
                 
 
                 # Log performance stats periodically (every 5 seconds)
@@ -559,8 +567,9 @@ class BinDieselSystem:
                                   f"(min={stats['fps_min']:.1f}, max={stats['fps_max']:.1f})",
                                   config.DEBUG_MODE)
                 
-                # Small delay to prevent CPU spinning
-                time.sleep(0.01)
+                # Pace the loop to a fixed period (prevents CPU spinning without
+                # adding a fixed delay on top of slow iterations)
+                self.loop_rate.wait()
         
         except KeyboardInterrupt:
             log_info(self.logger, "Interrupted by user")
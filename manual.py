@@ -9,7 +9,9 @@ Voice-controlled manual car operation
 
 import sys
 import time
+import queue
 import signal
+import threading
 from pathlib import Path
 
 # Add parent directory to path if needed
@@ -36,6 +38,10 @@ class ManualControl:
     COMMAND_RIGHT = 'RIGHT'
     COMMAND_TURN_AROUND = 'TURN_AROUND'
     
+    # Movement commands accepted in manual mode (anything else is a mode-switch command)
+    MOVE_COMMANDS = frozenset({COMMAND_STOP, COMMAND_FORWARD, COMMAND_LEFT,
+                               COMMAND_RIGHT, COMMAND_TURN_AROUND})
+    
     def __init__(self):
         """Initialize manual control system"""
         log_info(logger, "Initializing manual control system...")
@@ -94,6 +100,11 @@ class ManualControl:
         # Emergency stop flag
         self.emergency_stopped = False
         
+        # Recognized voice commands, filled by a background listener thread so the
+        # control loop (and TOF checks) never block on the microphone
+        self._cmd_queue = queue.Queue(maxsize=4)
+        self._voice_thread = None
+        
         # Setup signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -133,6 +144,21 @@ class ManualControl:
             log_error(logger, e, "Error checking TOF sensor")
             return False
     
+    def _voice_worker(self):
+        """Background thread: listen for voice commands and queue them for run()"""
+        while self.running:
+            try:
+                command = self.voice.recognize_command(timeout=1.0)
+            except Exception as e:
+                log_error(logger, e, "Error recognizing voice command")
+                time.sleep(0.5)
+                continue
+            if command:
+                try:
+                    self._cmd_queue.put_nowait(command)
+                except queue.Full:
+                    pass  # Control loop is behind - drop the command rather than block
+    
     def stop_all(self):
         """Stop motor and center servo"""
         self.motor.stop()
@@ -196,64 +222,53 @@ class ManualControl:
         # Start in stopped state
         self.stop_all()
         
-        # Last command check time (for continuous execution)
-        last_command_check = time.time()
-        command_check_interval = 0.1  # Check for new commands every 100ms
+        # Listen for commands in the background (blocking listen + transcription there)
+        self._voice_thread = threading.Thread(target=self._voice_worker, daemon=True)
+        self._voice_thread.start()
+        
+        # Loop-invariant lookups hoisted into locals (the loop runs ~20 times per second)
+        check_emergency_stop = self.check_emergency_stop
+        cmd_queue = self._cmd_queue
+        command_duration = self.command_duration
+        now = time.time
         
         # Continuous command execution loop
         while self.running:
             try:
                 # Check for emergency stop (highest priority)
-                if self.check_emergency_stop():
-                    # Emergency stop active - don't execute commands
+                if check_emergency_stop():
+                    # Emergency stop active - don't execute commands (discard any heard meanwhile)
+                    while not cmd_queue.empty():
+                        cmd_queue.get_nowait()
                     time.sleep(0.1)
                     continue
                 
-                # Check for new voice command (non-blocking)
-                current_time = time.time()
-                if current_time - last_command_check >= command_check_interval:
-                    # Try to recognize a command (with short timeout to avoid blocking)
-                    command = self.voice.recognize_command(timeout=0.1)
-                    
-                    if command:
-                        # Filter out mode-switching commands (only accept movement commands)
-                        if command in [self.COMMAND_STOP, self.COMMAND_FORWARD, 
-                                       self.COMMAND_LEFT, self.COMMAND_RIGHT, 
-                                       self.COMMAND_TURN_AROUND]:
-                            self.execute_command(command)
-                            last_command_check = current_time
-                        else:
-                            # Mode switching command - ignore in manual mode
-                            log_info(logger, f"Ignoring mode command in manual mode: {command}")
-                    
-                    last_command_check = current_time
+                # Wait briefly for a new voice command - this also paces the loop
+                # (TOF is checked at least every 50ms)
+                try:
+                    command = cmd_queue.get(timeout=0.05)
+                except queue.Empty:
+                    command = None
+                
+                if command:
+                    # Filter out mode-switching commands (only accept movement commands)
+                    if command in self.MOVE_COMMANDS:
+                        self.execute_command(command)
+                    else:
+                        # Mode switching command - ignore in manual mode
+                        log_info(logger, f"Ignoring mode command in manual mode: {command}")
                 
                 # Check if current command has exceeded duration
                 if self.command_start_time is not None:
-                    elapsed_time = time.time() - self.command_start_time
-                    if elapsed_time >= self.command_duration:
+                    elapsed_time = now() - self.command_start_time
+                    if elapsed_time >= command_duration:
                         # Command duration exceeded - stop automatically
-                        log_info(logger, f"Command '{self.current_command}' completed after {self.command_duration} seconds")
+                        log_info(logger, f"Command '{self.current_command}' completed after {command_duration} seconds")
                         self.stop_all()
                         self.command_start_time = None
                 
-                # Continue executing current command (if still active and not stopped)
-                if self.current_command != self.COMMAND_STOP and self.command_start_time is not None:
-                    if not self.emergency_stopped:
-                        if self.current_command == self.COMMAND_FORWARD:
-                            self.motor.forward(config.MOTOR_MEDIUM)
-                            self.servo.center()
-                        elif self.current_command == self.COMMAND_LEFT:
-                            # Set both motor and servo for left turn
-                            self.servo.turn_left(1.0)
-                            self.motor.forward(config.MOTOR_MEDIUM)
-                        elif self.current_command == self.COMMAND_RIGHT:
-                            # Set both motor and servo for right turn
-                            self.servo.turn_right(1.0)
-                            self.motor.forward(config.MOTOR_MEDIUM)
-                
-                # Small sleep to prevent CPU spinning
-                time.sleep(0.05)
+                # NOTE: the active command is not re-issued every iteration - execute_command()
+                # already set the motor/servo, and the PWM keeps outputting that duty
             
             except KeyboardInterrupt:
                 log_info(logger, "Keyboard interrupt received")
@@ -269,13 +284,24 @@ class ManualControl:
     def cleanup(self):
         """Cleanup resources"""
         log_info(logger, "Cleaning up...")
+        self.running = False
         self.stop_all()
         
-        try:
-            if hasattr(self, 'voice'):
-                self.voice.cleanup()
-        except Exception as e:
-            log_error(logger, e, "Error cleaning up voice recognizer")
+        # Let the listener thread finish its current listen before releasing the mic
+        voice_thread = getattr(self, '_voice_thread', None)
+        if voice_thread is not None:
+            voice_thread.join(timeout=2.0)
+        
+        if voice_thread is not None and voice_thread.is_alive():
+            # Still inside listen/transcribe - releasing the mic under it would crash the thread.
+            # It is a daemon thread, so it goes away with the process
+            log_warning(logger, "Voice listener still running", "Skipping voice recognizer cleanup")
+        else:
+            try:
+                if hasattr(self, 'voice'):
+                    self.voice.cleanup()
+            except Exception as e:
+                log_error(logger, e, "Error cleaning up voice recognizer")
         
         try:
             if hasattr(self, 'motor'):
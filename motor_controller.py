@@ -17,6 +17,7 @@ class MotorController:
         self.pwm_pin = pwm_pin
         self.frequency = frequency        # set correct f?
         self.pwm = None 
+        self._last_duty = None  # Last duty written to the PWM (skip rewriting the same value)
 
         if config.USE_GPIO:
             GPIO.setmode(GPIO.BCM)          
@@ -34,6 +35,11 @@ class MotorController:
         # when PWM drops below threshold (due to rounding, init, or shutdown)
         duty = max(65.0, min(100.0, duty))
 
+        # Same duty as last time: the PWM already outputs it, skip the write
+        if duty == self._last_duty:
+            return
+        self._last_duty = duty
+
         if config.USE_GPIO:
             self.pwm.ChangeDutyCycle(duty)
 
@@ -41,6 +47,10 @@ class MotorController:
             print(f"[Motor] forward speed = {speed:.2f} (duty = {duty:.1f}% clamped)")
 
     def stop(self):
+        if self._last_duty == config.MOTOR_STOP:
+            return
+        self._last_duty = config.MOTOR_STOP
+
         if config.USE_GPIO and self.pwm:
             self.pwm.ChangeDutyCycle(config.MOTOR_STOP)
 
@@ -48,6 +58,7 @@ class MotorController:
             print("[Motor] stop()")
 
     def cleanup(self):                   
+        self._last_duty = None
         if config.USE_GPIO:
             if self.pwm:
                 self.pwm.stop()
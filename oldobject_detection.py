@@ -32,7 +32,6 @@ except ImportError:
         CAMERA_ROTATION = 0
         CAMERA_FLIP_HORIZONTAL = False
         CAMERA_FLIP_VERTICAL = False
-        CAMERA_SWAP_RB = False
 
 
 # Configuration
@@ -124,12 +123,6 @@ def detect(width=DISPLAY_WIDTH, height=DISPLAY_HEIGHT, model_name=MODEL_NAME,
             if config.CAMERA_FLIP_VERTICAL:
                 array = cv2.flip(array, 0)  # Vertical flip
             
-            # Fix color channel swap (red/blue)
-            if config.CAMERA_SWAP_RB:
-                # Swap red and blue channels: RGB -> BGR -> RGB (swaps R and B)
-                array = cv2.cvtColor(array, cv2.COLOR_RGB2BGR)
-                array = cv2.cvtColor(array, cv2.COLOR_BGR2RGB)
-            
             # Convert RGB to BGR for OpenCV
             frame = cv2.cvtColor(array, cv2.COLOR_RGB2BGR)
             
@@ -36,7 +36,11 @@ class PerformanceMonitor:
     
     def __init__(self, window_size=30):
         self.window_size = window_size
-        self.fps_history = deque(maxlen=window_size)
+        # FPS samples live in a fixed-size ring buffer: O(1) update, no per-frame
+        # allocation, and the stats are numpy reductions over contiguous memory
+        self.fps_history = np.zeros(window_size, dtype=np.float32)
+        self._fps_index = 0
+        self._fps_count = 0
         self.latency_history = deque(maxlen=window_size)
         self.last_time = time.time()
     
@@ -45,30 +49,54 @@ class PerformanceMonitor:
         current_time = time.time()
         dt = current_time - self.last_time
         if dt > 0:
-            fps = 1.0 / dt
-            self.fps_history.append(fps)
+            self.fps_history[self._fps_index] = 1.0 / dt
+            self._fps_index = (self._fps_index + 1) % self.window_size
+            self._fps_count = min(self._fps_count + 1, self.window_size)
         self.last_time = current_time
     
     def get_fps(self):
         """Get average FPS"""
-        if not self.fps_history:
+        if not self._fps_count:
             return 0.0
-        return sum(self.fps_history) / len(self.fps_history)
+        return float(self.fps_history[:self._fps_count].mean())
     
     def get_stats(self):
         """Get performance statistics"""
-        if not self.fps_history:
+        if not self._fps_count:
             return {'fps': 0.0, 'fps_min': 0.0, 'fps_max': 0.0}
         
-        fps_list = list(self.fps_history)
+        # Order within the window doesn't matter for these stats
+        fps_window = self.fps_history[:self._fps_count]
         return {
-            'fps': sum(fps_list) / len(fps_list),
-            'fps_min': min(fps_list),
-            'fps_max': max(fps_list),
-            'fps_std': np.std(fps_list) if len(fps_list) > 1 else 0.0
+            'fps': float(fps_window.mean()),
+            'fps_min': float(fps_window.min()),
+            'fps_max': float(fps_window.max()),
+            'fps_std': float(fps_window.std()) if self._fps_count > 1 else 0.0
         }
 
 
+class LoopRateLimiter:
+    """Pace a loop to a fixed period by sleeping until the next deadline"""
+    
+    def __init__(self, period):
+        self.period = period
+        self._next_deadline = time.monotonic()
+    
+    def wait(self):
+        """
+        Sleep until the next deadline
+        Unlike a constant sleep after the work, the loop period stays fixed no matter
+        how long the iteration took (a late loop does not sleep at all)
+        """
+        now = time.monotonic()
+        self._next_deadline += self.period
+        if self._next_deadline > now:
+            time.sleep(self._next_deadline - now)
+        else:
+            # Running late: restart the schedule instead of bursting to catch up
+            self._next_deadline = now
+
+
 def conditional_log(logger, level, message, condition=True, *args, **kwargs):
     """
     Conditional logging - only log if condition is True
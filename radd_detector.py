@@ -6,6 +6,7 @@ Uses YOLO clothing detection model for accurate detection
 Reference: https://github.com/kesimeg/YOLO-Clothing-Detection
 """
 
+import time
 import numpy as np
 import cv2
 import config
@@ -140,7 +141,6 @@ class RADDDetector:
                 'active_violators': list of currently active violator IDs
             }
         """
-        import time
         current_time = time.time()
         
         # Clean up old violators (not seen recently)
@@ -275,8 +275,6 @@ class RADDDetector:
         Returns:
             Annotated frame in BGR format with YOLO overlay + RADD violation info
         """
-        import cv2
-        
         if tracked_violators is None:
             tracked_violators = self.tracked_violators
         
@@ -725,7 +723,6 @@ class RADDDetector:
 def main():
     """Test RADD detector with camera feed"""
     import argparse
-    import time
     from picamera2 import Picamera2
     
     parser = argparse.ArgumentParser(description='Test RADD detector')
@@ -803,11 +800,6 @@ def main():
             if config.CAMERA_FLIP_VERTICAL:
                 frame = cv2.flip(frame, 0)
             
-            # Fix color channel swap if needed
-            if config.CAMERA_SWAP_RB:
-                frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
             # Detect persons using pose tracker
             results, _ = pose_tracker.detect(frame)
             tracked_persons = {}
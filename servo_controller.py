@@ -21,8 +21,13 @@ class ServoController:
         self.center_duty = center_duty
         self.left_max_duty = left_max_duty
         self.right_max_duty = right_max_duty
+        # Clamp range, independent of which side has the larger duty (a calibration that
+        # swaps left/right must not pin every command to one end)
+        self._min_duty = min(left_max_duty, right_max_duty)
+        self._max_duty = max(left_max_duty, right_max_duty)
         self.last_angle = None 
         self.pwm = None
+        self._last_duty = None  # Last duty written to the PWM (skip rewriting the same value)
 
         if config.USE_GPIO:
             GPIO.setmode(GPIO.BCM)
@@ -43,11 +48,16 @@ class ServoController:
 
     def _set_duty(self, duty):
 
-        if duty > self.left_max_duty:
-            duty = self.left_max_duty
+        if duty > self._max_duty:
+            duty = self._max_duty
 
-        if duty < self.right_max_duty:
-            duty = self.right_max_duty
+        if duty < self._min_duty:
+            duty = self._min_duty
+
+        # Same duty as last time: the PWM already outputs it, skip the write
+        if duty == self._last_duty:
+            return
+        self._last_duty = duty
 
         if config.USE_GPIO and self.pwm:
             self.pwm.ChangeDutyCycle(duty)
@@ -285,18 +285,19 @@ class ArUcoDetector:
             'pose': pose
         }
     
-    def draw_overlay(self, frame, detection):
+    def draw_overlay(self, frame, detection, copy=True):
         """
         Draw ArUco marker detection overlay on frame
         
         Args:
             frame: BGR frame
             detection: Detection result from detect_tag()
+            copy: Draw on a copy of frame (False draws in place when the caller is done with frame)
             
         Returns:
             Annotated frame
         """
-        annotated = frame.copy()
+        annotated = frame.copy() if copy else frame
         
         if not detection['detected']:
             cv2.putText(annotated, "No ArUco marker detected", (10, 30),
@@ -414,7 +415,10 @@ class ArUcoNavigationTest:
             self.webcam.set(cv2.CAP_PROP_FRAME_WIDTH, config.CAMERA_WIDTH)
             self.webcam.set(cv2.CAP_PROP_FRAME_HEIGHT, config.CAMERA_HEIGHT)
             self.webcam.set(cv2.CAP_PROP_FPS, config.CAMERA_FPS)
-            
+            # Keep only the newest frame in the driver queue so read() never returns a stale
+            # backlog frame when detection runs slower than the camera
+            self.webcam.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
             # Read a test frame to ensure camera is working
             ret, _ = self.webcam.read()
             if not ret:
@@ -516,7 +520,7 @@ class ArUcoNavigationTest:
                             self.servo.center()
                             
                             if display:
-                                annotated = self.tag_detector.draw_overlay(frame, detection)
+                                annotated = self.tag_detector.draw_overlay(frame, detection, copy=False)
                                 cv2.putText(annotated, "STOPPED - Marker reached!", (10, 180),
                                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
                                 cv2.imshow('ArUco Navigation', annotated)
@@ -557,7 +561,7 @@ class ArUcoNavigationTest:
                 
                 # Display frame if requested
                 if display:
-                    annotated = self.tag_detector.draw_overlay(frame, detection)
+                    annotated = self.tag_detector.draw_overlay(frame, detection, copy=False)
                     
                     # Add FPS counter
                     frame_count += 1
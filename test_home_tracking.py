@@ -22,7 +22,7 @@ import cv2
 import config
 import numpy as np
 from pathlib import Path
-from home_marker_detector import detect_red_box, check_color_match_red
+from home_marker_detector import detect_red_box, check_color_match_red, warmup_yolo
 from logger import setup_logger, log_info, log_warning, log_error
 from servo_controller import ServoController
 from motor_controller import MotorController
@@ -38,6 +38,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 class CentroidTracker:
     """Simple centroid-based tracker (works on all platforms without cv2.legacy)"""
     yolo_model = None  # Set by parent class
+    inference_size = None  # Set by parent class
     
     def __init__(self, max_distance=100, max_lost_frames=5):
         self.last_bbox = None
@@ -51,8 +52,8 @@ class CentroidTracker:
         self.lost_frames = 0
         return True
     
-    def update(self, frame):
-        """Update tracker (re-run YOLO detection to find marker)"""
+    def update(self, frame, frame_rgb=None):
+        """Update tracker (re-run YOLO detection to find marker; frame_rgb skips a BGR->RGB conversion)"""
         if not self.yolo_model:
             return False, self.last_bbox
         
@@ -62,7 +63,9 @@ class CentroidTracker:
             frame,
             confidence_threshold=0.20,  # Lowered for lock mode reliability
             color_threshold=0.15,       # Slightly loosened for lock mode (15% match)
-            square_aspect_ratio_tolerance=0.55  # Moderate tolerance for shapes
+            square_aspect_ratio_tolerance=0.55,  # Moderate tolerance for shapes
+            imgsz=self.inference_size,
+            frame_rgb=frame_rgb
         )
         
         if marker['detected']:
@@ -114,6 +117,20 @@ class HomeMarkerTracker:
             else:
                 raise
         
+        # Fold rotation and flips into one rotate + one flip, worked out once up front
+        # 180 deg rotation == flipping both axes, and flips commute, so 0/180 with any
+        # flips collapses to a single cv2.flip (or nothing)
+        flip_h = bool(config.CAMERA_FLIP_HORIZONTAL)
+        flip_v = bool(config.CAMERA_FLIP_VERTICAL)
+        self._rotate_code = None
+        if config.CAMERA_ROTATION == 180:
+            flip_h, flip_v = not flip_h, not flip_v
+        elif config.CAMERA_ROTATION == 90:
+            self._rotate_code = cv2.ROTATE_90_CLOCKWISE
+        elif config.CAMERA_ROTATION == 270:
+            self._rotate_code = cv2.ROTATE_90_COUNTERCLOCKWISE
+        self._flip_code = {(True, False): 1, (False, True): 0, (True, True): -1}.get((flip_h, flip_v))
+        
         # Camera
         if use_camera:
             from picamera2 import Picamera2
@@ -155,7 +172,16 @@ class HomeMarkerTracker:
         self.lost_count = 0
         self.lost_threshold = 10
         
+        # Run YOLO at the frame's own size (rounded up to the model stride of 32) so the
+        # NCNN model doesn't letterbox 640x480 into a padded 640x640 input every frame
+        frame_h, frame_w = config.CAMERA_HEIGHT, config.CAMERA_WIDTH
+        if config.CAMERA_ROTATION in (90, 270):
+            frame_h, frame_w = frame_w, frame_h
+        self.inference_size = tuple(-(-dim // 32) * 32 for dim in (frame_h, frame_w))
+        warmup_yolo(self.yolo_model, frame_h, frame_w, imgsz=self.inference_size)
+        
         CentroidTracker.yolo_model = self.yolo_model
+        CentroidTracker.inference_size = self.inference_size
         
         # Performance tracking
         self.motor_enabled = True
@@ -212,25 +238,17 @@ class HomeMarkerTracker:
         if self.use_camera and self.picam2:
             frame = self.picam2.capture_array(wait=True)  # Returns RGB
             
-            # Apply camera rotation if configured
-            if config.CAMERA_ROTATION == 180:
-                frame = cv2.rotate(frame, cv2.ROTATE_180)
-            elif config.CAMERA_ROTATION == 90:
-                frame = cv2.rotate(frame, cv2.ROTATE_90_CLOCKWISE)
-            elif config.CAMERA_ROTATION == 270:
-                frame = cv2.rotate(frame, cv2.ROTATE_90_COUNTERCLOCKWISE)
-            
-            # Apply flips if configured
-            if config.CAMERA_FLIP_HORIZONTAL:
-                frame = cv2.flip(frame, 1)
-            if config.CAMERA_FLIP_VERTICAL:
-                frame = cv2.flip(frame, 0)
+            # Apply camera rotation/flips (pre-folded in __init__: at most one pass each)
+            if self._rotate_code is not None:
+                frame = cv2.rotate(frame, self._rotate_code)
+            if self._flip_code is not None:
+                frame = cv2.flip(frame, self._flip_code)
             
             return frame
         else:
             return np.zeros((config.CAMERA_HEIGHT, config.CAMERA_WIDTH, 3), dtype=np.uint8) + 50
 #####################################################################################################
-    def handle_scan_mode(self, frame_bgr):
+    def handle_scan_mode(self, frame_bgr, frame_rgb=None):
         """Scan for home marker (no lock yet)"""
 
         if self.run_flag == False:
@@ -242,7 +260,9 @@ class HomeMarkerTracker:
             frame_bgr,
             confidence_threshold=self.confidence_threshold,
             color_threshold=self.color_threshold,
-            square_aspect_ratio_tolerance=self.square_tolerance
+            square_aspect_ratio_tolerance=self.square_tolerance,
+            imgsz=self.inference_size,
+            frame_rgb=frame_rgb
         )
         
         if marker['detected']:
@@ -266,7 +286,7 @@ class HomeMarkerTracker:
             self.motor.forward(self.slow_speed)
         return None
 #####################################################################################################
-    def handle_lock_mode(self, frame_bgr):
+    def handle_lock_mode(self, frame_bgr, frame_rgb=None):
         """Track locked marker with servo/motor steering"""
         self.run_flag = True
 
@@ -277,7 +297,7 @@ class HomeMarkerTracker:
             return None
         
         # Track using centroid tracker (re-detects marker each frame)
-        ok, bbox = self.tracker.update(frame_bgr)
+        ok, bbox = self.tracker.update(frame_bgr, frame_rgb)
         
         if not ok:
             log_info(self.logger, "Lost lock, returning to scan mode")
@@ -482,10 +502,11 @@ class HomeMarkerTracker:
                     detection = self.last_detection
                     mode_str = "STOPPED (press 's' to restart)"
                 elif self.is_scanning:
-                    detection = self.handle_scan_mode(frame_bgr)
+                    # Pass the camera's RGB frame along so YOLO doesn't convert BGR back to RGB
+                    detection = self.handle_scan_mode(frame_bgr, frame_rgb)
                     mode_str = "SCAN (searching)"
                 elif self.is_locked:
-                    detection = self.handle_lock_mode(frame_bgr)
+                    detection = self.handle_lock_mode(frame_bgr, frame_rgb)
                     mode_str = "LOCK (tracking)"
                 else:
                     detection = None
@@ -17,36 +17,40 @@ def main():
         frequency = config.PWM_FREQUENCY_MOTOR,
     )
 
-    # Test center position
+    # try/finally: stop and release the PWM pin even on Ctrl+C mid-test, so the
+    # motor isn't left running at the last commanded speed
+    try:
+        # Test center position
 
        
-    print("\nDrive forward")
-    motor.forward(1.1)
-    time.sleep(3.0)
+        print("\nDrive forward")
+        motor.forward(1.1)
+        time.sleep(3.0)
     
-    print("\nDrive forward")
-    motor.forward(1.0)
-    time.sleep(3.0)
-
-    print("\nDrive forward")
-    motor.forward(0.9)
-    time.sleep(3.0)
-
-    print("\nDrive forward")
-    motor.forward(0.8)
-    time.sleep(3.0)
-
-    print("\nDrive forward")
-    motor.forward(0.7)
-    time.sleep(3.0)
-
-
-        # Back to center again
-    print("Now stop")
-    motor.stop()
-    time.sleep(3.0)
-
-    motor.cleanup()
+        print("\nDrive forward")
+        motor.forward(1.0)
+        time.sleep(3.0)
+
+        print("\nDrive forward")
+        motor.forward(0.9)
+        time.sleep(3.0)
+
+        print("\nDrive forward")
+        motor.forward(0.8)
+        time.sleep(3.0)
+
+        print("\nDrive forward")
+        motor.forward(0.7)
+        time.sleep(3.0)
+
+
+            # Back to center again
+        print("Now stop")
+        motor.stop()
+        time.sleep(3.0)
+    finally:
+        motor.stop()
+        motor.cleanup()
     print("=== Test Finished ===\n")
 
 if __name__ == "__main__":
@@ -4,8 +4,8 @@ Test script for voice recognition (manual mode)
 Tests OpenAI Whisper API for command recognition
 """
 
-import time
 import sys
+import traceback
 from voice_recognizer import VoiceRecognizer
 import config
 
@@ -63,13 +63,13 @@ def main():
                 print(f"  Success rate: {success_count}/{command_count} ({success_count/command_count*100:.1f}%)")
                 print()
             
-            time.sleep(1)  # Small delay between attempts
+            # No delay between attempts: recognize_command() blocks on the microphone,
+            # so audio arrival paces the loop (a sleep here only misses speech)
     
     except KeyboardInterrupt:
         print("\n[TEST] Interrupted by user")
     except Exception as e:
         print(f"\n[TEST] ERROR: {e}")
-        import traceback
         traceback.print_exc()
     finally:
         if 'recognizer' in locals():
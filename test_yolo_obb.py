@@ -129,12 +129,6 @@ class YOLOOBBDetector:
         if config.CAMERA_FLIP_VERTICAL:
             array = cv2.flip(array, 0)  # Vertical flip
         
-        # Fix color channel swap (red/blue)
-        if config.CAMERA_SWAP_RB:
-            # Swap red and blue channels: RGB -> BGR -> RGB (swaps R and B)
-            array = cv2.cvtColor(array, cv2.COLOR_RGB2BGR)
-            array = cv2.cvtColor(array, cv2.COLOR_BGR2RGB)
-        
         return array
     
     def detect(self, frame):
@@ -6,6 +6,7 @@ Optimized for speed and efficiency on Raspberry Pi
 """
 
 import cv2
+import math
 import numpy as np
 import time
 import argparse
@@ -30,6 +31,12 @@ class YOLOPoseTracker:
     Uses YOLO11 pose model for person detection + pose estimation + tracking
     """
     
+    # (shoulder, elbow, wrist) keypoint indices per arm - see calculate_arm_angle
+    ARM_KEYPOINTS = {
+        'left': [5, 7, 9],
+        'right': [6, 8, 10],
+    }
+    
     def __init__(self, 
                  model_path=config.YOLO_POSE_MODEL,  # Pose model (uses config, supports NCNN)
                  width=640, 
@@ -54,7 +61,28 @@ class YOLOPoseTracker:
         self.tracker = tracker  # Store tracker config (e.g., 'bytetrack.yaml')
         self.frame_center_x = width // 2
         self.debug_mode = config.DEBUG_MODE
-        self._frame_counter = 0; 
+        self._frame_counter = 0  # Frames seen by detect() - paces the periodic arm debug output
+        
+        # YOLO input size: the frame's aspect ratio with its long side at YOLO_INFERENCE_SIZE,
+        # rounded up to the model stride of 32 - a 640x480 frame then runs as 640x480 instead of
+        # being letterboxed into a padded 640x640 input (25% of the convolution work is padding)
+        frame_h, frame_w = (width, height) if config.CAMERA_ROTATION in (90, 270) else (height, width)
+        scale = config.YOLO_INFERENCE_SIZE / max(frame_h, frame_w)
+        self.inference_size = tuple(-(-int(round(dim * scale)) // 32) * 32 for dim in (frame_h, frame_w))
+        
+        # Fold rotation and flips into one rotate + one flip, worked out once up front
+        # 180 deg rotation == flipping both axes, and flips commute, so 0/180 with any
+        # flips collapses to a single cv2.flip (or nothing)
+        flip_h = bool(config.CAMERA_FLIP_HORIZONTAL)
+        flip_v = bool(config.CAMERA_FLIP_VERTICAL)
+        self._rotate_code = None
+        if config.CAMERA_ROTATION == 180:
+            flip_h, flip_v = not flip_h, not flip_v
+        elif config.CAMERA_ROTATION == 90:
+            self._rotate_code = cv2.ROTATE_90_CLOCKWISE
+        elif config.CAMERA_ROTATION == 270:
+            self._rotate_code = cv2.ROTATE_90_COUNTERCLOCKWISE
+        self._flip_code = {(True, False): 1, (False, True): 0, (True, True): -1}.get((flip_h, flip_v))
         
         # Initialize YOLO pose model (NCNN or PyTorch)
         print(f"[YOLOPoseTracker] Loading YOLO pose model: {model_path}...")
@@ -114,9 +142,12 @@ class YOLOPoseTracker:
                 self.picam2 = Picamera2()
             
             # Create preview configuration with FPS control
+            # buffer_count=2: inference runs well below camera FPS, so extra queued buffers only
+            # hold older frames (and ~1 MB each of CMA memory); two keeps capture double-buffered
             preview_config = self.picam2.create_preview_configuration(
                 main={"size": (width, height), "format": "RGB888"},
-                controls={"FrameRate": config.CAMERA_FPS}  # Set target FPS
+                controls={"FrameRate": config.CAMERA_FPS},  # Set target FPS
+                buffer_count=2
             )
             
             # Configure camera (this must complete before start)
@@ -180,36 +211,39 @@ class YOLOPoseTracker:
         self.tracked_persons = {}  # track_id -> person data
         self.last_frame_time = time.time()
         self.fps = 0.0
+        self._paused = False
+    
+    def pause(self):
+        """Stop the camera stream while vision isn't needed (e.g. IDLE) - saves ISP/CPU work"""
+        if self.picam2 and not self._paused:
+            self.picam2.stop()
+            self._paused = True
+    
+    def resume(self):
+        """Restart the camera stream after pause() (configuration is kept)"""
+        if self.picam2 and self._paused:
+            self.picam2.start()
+            self._paused = False
     
     def get_frame(self):
         """
         Get current camera frame with rotation and color correction
+        Resumes the camera first if it was paused
         
         Returns:
             Frame in RGB format
         """
+        if self._paused:
+            self.resume()
+        
         # Use wait=True to ensure allocator is ready before capture
         array = self.picam2.capture_array(wait=True)  # Returns RGB
         
-        # Apply camera rotation if configured
-        if config.CAMERA_ROTATION == 180:
-            array = cv2.rotate(array, cv2.ROTATE_180)
-        elif config.CAMERA_ROTATION == 90:
-            array = cv2.rotate(array, cv2.ROTATE_90_CLOCKWISE)
-        elif config.CAMERA_ROTATION == 270:
-            array = cv2.rotate(array, cv2.ROTATE_90_COUNTERCLOCKWISE)
-        
-        # Apply flips if configured
-        if config.CAMERA_FLIP_HORIZONTAL:
-            array = cv2.flip(array, 1)  # Horizontal flip
-        if config.CAMERA_FLIP_VERTICAL:
-            array = cv2.flip(array, 0)  # Vertical flip
-        
-        # Fix color channel swap (red/blue)
-        if config.CAMERA_SWAP_RB:
-            # Swap red and blue channels: RGB -> BGR -> RGB (swaps R and B)
-            array = cv2.cvtColor(array, cv2.COLOR_RGB2BGR)
-            array = cv2.cvtColor(array, cv2.COLOR_BGR2RGB)
+        # Apply camera rotation/flips (pre-folded in __init__: at most one pass each)
+        if self._rotate_code is not None:
+            array = cv2.rotate(array, self._rotate_code)
+        if self._flip_code is not None:
+            array = cv2.flip(array, self._flip_code)
         
         return array
     
@@ -235,14 +269,8 @@ class YOLOPoseTracker:
         # 13: left_knee, 14: right_knee
         # 15: left_ankle, 16: right_ankle
         
-        if arm_side == 'left':
-            shoulder_idx = 5
-            elbow_idx = 7
-            wrist_idx = 9
-        else:  # right
-            shoulder_idx = 6
-            elbow_idx = 8
-            wrist_idx = 10
+        arm_idx = self.ARM_KEYPOINTS['left' if arm_side == 'left' else 'right']
+        shoulder_idx, elbow_idx, wrist_idx = arm_idx
         
         # Check if keypoints are visible (very low confidence threshold - accept any detection)
         shoulder_conf = keypoints[shoulder_idx][2]
@@ -259,18 +287,16 @@ class YOLOPoseTracker:
                 print(f"  [{arm_side.upper()} ARM] Low confidence: shoulder={shoulder_conf:.2f}, elbow={elbow_conf:.2f}, wrist={wrist_conf:.2f} (min={min_keypoint_confidence})")
             return None
         
-        # Get keypoint positions
-        shoulder = np.array([keypoints[shoulder_idx][0], keypoints[shoulder_idx][1]], dtype=np.float32)
-        elbow = np.array([keypoints[elbow_idx][0], keypoints[elbow_idx][1]], dtype=np.float32)
-        wrist = np.array([keypoints[wrist_idx][0], keypoints[wrist_idx][1]], dtype=np.float32)
+        # Get keypoint positions - one gather into a 3x2 (shoulder, elbow, wrist) array
+        pts = np.asarray(keypoints, dtype=np.float32)[arm_idx, :2]
+        shoulder, wrist = pts[0], pts[2]
         
-        # Calculate vectors
-        upper_arm = elbow - shoulder
-        lower_arm = wrist - elbow
+        # Calculate vectors (row 0 = upper arm, row 1 = lower arm) and their lengths in one pass
+        arm_vecs = pts[1:] - pts[:-1]
+        upper_arm, lower_arm = arm_vecs
         
         # Check minimum arm length (avoid noise from very short segments)
-        upper_arm_length = np.linalg.norm(upper_arm)
-        lower_arm_length = np.linalg.norm(lower_arm)
+        upper_arm_length, lower_arm_length = np.hypot(arm_vecs[:, 0], arm_vecs[:, 1])
         
         # Minimum arm segment lengths (pixels) - adjust based on camera distance
         min_upper_arm = 15  # Minimum upper arm length
@@ -285,20 +311,19 @@ class YOLOPoseTracker:
         # Use atan2 with proper sign handling for left/right
         if arm_side == 'left':
             # For left arm, positive x means extending left (away from body)
-            angle_from_vertical = np.arctan2(abs(upper_arm[0]), abs(upper_arm[1])) * 180 / np.pi
+            angle_from_vertical = math.degrees(math.atan2(abs(upper_arm[0]), abs(upper_arm[1])))
         else:  # right
             # For right arm, positive x means extending right (away from body)
-            angle_from_vertical = np.arctan2(abs(upper_arm[0]), abs(upper_arm[1])) * 180 / np.pi
+            angle_from_vertical = math.degrees(math.atan2(abs(upper_arm[0]), abs(upper_arm[1])))
         
         # Calculate elbow angle (bend in arm)
         # Note: When arm is raised straight to the side, elbow can be nearly straight (small angle)
         # This is valid! We use elbow angle only to filter out impossible poses, not as strict requirement
         elbow_angle = None
         if upper_arm_length > 0 and lower_arm_length > 0:
-            upper_arm_norm = upper_arm / upper_arm_length
-            lower_arm_norm = lower_arm / lower_arm_length
-            dot_product = np.clip(np.dot(upper_arm_norm, lower_arm_norm), -1.0, 1.0)
-            elbow_angle = np.arccos(dot_product) * 180 / np.pi
+            # Scalar math-module trig: these are single values, numpy ufunc dispatch costs more than the math
+            dot_product = float(upper_arm[0] * lower_arm[0] + upper_arm[1] * lower_arm[1]) / float(upper_arm_length * lower_arm_length)
+            elbow_angle = math.degrees(math.acos(max(-1.0, min(1.0, dot_product))))
         else:
             return None
         
@@ -307,13 +332,13 @@ class YOLOPoseTracker:
         
         # Calculate total arm vector (shoulder to wrist) for better angle measurement
         total_arm = wrist - shoulder
-        total_arm_length = np.linalg.norm(total_arm)
+        total_arm_length = math.hypot(total_arm[0], total_arm[1])
         
         # Recalculate angle from vertical using TOTAL arm (shoulder to wrist)
         # This is more accurate for raised arms regardless of elbow bend
         if total_arm_length > 0:
             # Angle of total arm from vertical (0° = straight down, 90° = horizontal)
-            total_arm_angle = np.arctan2(abs(total_arm[0]), abs(total_arm[1])) * 180 / np.pi
+            total_arm_angle = math.degrees(math.atan2(abs(total_arm[0]), abs(total_arm[1])))
         else:
             total_arm_angle = angle_from_vertical  # Fallback to upper arm angle
         
@@ -400,6 +425,7 @@ class YOLOPoseTracker:
             'tracked_persons': {},
             'fps': self.fps
         }
+        self._frame_counter += 1
         
         # Run YOLO inference with tracking
         # Use track mode for object tracking (per YOLO docs: https://docs.ultralytics.com/modes/track/)
@@ -412,7 +438,7 @@ class YOLOPoseTracker:
             tracker=self.tracker,  # Use stored tracker config (e.g., 'bytetrack.yaml' or 'botsort.yaml')
             show=False,  # Don't show results automatically
             half=False,  # Set to True if using GPU (faster but less accurate)
-            imgsz=config.YOLO_INFERENCE_SIZE,  # Match camera resolution (640) to avoid resize overhead
+            imgsz=self.inference_size,  # Frame aspect ratio, long side = YOLO_INFERENCE_SIZE (no square padding)
             max_det=config.YOLO_MAX_DET,  # Limit detections for speed (biggest performance gain)
             agnostic_nms=config.YOLO_AGNOSTIC_NMS  # Faster NMS processing
         )
@@ -425,28 +451,34 @@ class YOLOPoseTracker:
             yolo_result = result  # Store for overlay
             
             # Get boxes (detections)
-            if result.boxes is not None:
+            if result.boxes is not None and len(result.boxes) > 0:
                 boxes = result.boxes
                 
-                for i, box in enumerate(boxes):
+                # Pull every box field out in one tensor->numpy copy each, rather than a
+                # .cpu()/.numpy() round trip per box per field inside the loop
+                xyxy_all = boxes.xyxy.cpu().numpy().astype(int)
+                cls_all = boxes.cls.cpu().numpy().astype(int)
+                conf_all = boxes.conf.cpu().numpy()
+                ids_all = boxes.id.cpu().numpy().astype(int) if boxes.id is not None else None
+                kpts_all = result.keypoints.data.cpu().numpy() if result.keypoints is not None else None  # [N, 17, 3]
+                names = self.model.names
+                
+                for i in range(len(xyxy_all)):
                     # Get tracking ID if available
-                    track_id = None
-                    if box.id is not None:
-                        track_id = int(box.id[0])
+                    track_id = int(ids_all[i]) if ids_all is not None else None
                     
                     # Get class and confidence
-                    class_id = int(box.cls[0])
-                    confidence = float(box.conf[0])
-                    class_name = self.model.names[class_id]
+                    class_id = int(cls_all[i])
+                    confidence = float(conf_all[i])
+                    class_name = names[class_id]
                     
                     # Get bounding box
-                    x1, y1, x2, y2 = map(int, box.xyxy[0].cpu().numpy())
+                    x1, y1, x2, y2 = xyxy_all[i].tolist()
                     
                     # Get keypoints if available (pose detection)
                     keypoints = None
-                    if result.keypoints is not None and len(result.keypoints) > i:
-                        kpts = result.keypoints.data[i].cpu().numpy()  # [17, 3]
-                        keypoints = kpts
+                    if kpts_all is not None and len(kpts_all) > i:
+                        keypoints = kpts_all[i]  # [17, 3]
                     
                     # Store detection
                     detection = {
@@ -465,7 +497,7 @@ class YOLOPoseTracker:
                     # Also validate that keypoints are reasonable (at least some keypoints have confidence > 0.1)
                     if class_name == 'person' and keypoints is not None and confidence >= config.YOLO_PERSON_CONFIDENCE:
                         # Validate keypoints: at least 5 keypoints should have reasonable confidence
-                        valid_keypoints = sum(1 for kpt in keypoints if kpt[2] > 0.1)  # Count keypoints with conf > 0.1
+                        valid_keypoints = int((keypoints[:, 2] > 0.1).sum())  # Count keypoints with conf > 0.1
                         if valid_keypoints < 5:
                             # Skip this detection - keypoints are too unreliable
                             continue
@@ -682,7 +714,25 @@ def main():
     parser.add_argument('--conf', type=float, default=0.01, help='Confidence threshold (default: 0.01 for maximum detection - confidence boundaries removed)')
     parser.add_argument('--fps', action='store_true', help='Show FPS counter')
     parser.add_argument('--debug', action='store_true', help='Enable verbose debug output for arm detection')
+    parser.add_argument('--render-every', type=int, default=1,
+                       help='Draw and display only every Nth frame (default: 1 = every frame)')
+    parser.add_argument('--headless', action='store_true',
+                       help='No display window - skip all overlay drawing (terminal output only)')
     args = parser.parse_args()
+    render_every = max(1, args.render_every)
+    
+    # Process-wide thread pools, set once here rather than in the tracker so importers keep
+    # their own settings. OpenCV only does a rotate/flip per frame, so keep it off the
+    # cores YOLO's inference threads use
+    cv2.setNumThreads(getattr(config, 'OPENCV_NUM_THREADS', 1))
+    if not config.USE_NCNN:
+        # PyTorch models: cap torch's pool too (NCNN sizes its own threads, torch is unused)
+        try:
+            import torch
+            torch.set_num_threads(getattr(config, 'TORCH_NUM_THREADS', 3))
+            torch.set_num_interop_threads(1)
+        except ImportError:
+            pass
     
     # Store debug flag globally for use in calculate_arm_angle
     main.debug_mode = args.debug
@@ -717,29 +767,38 @@ def main():
         print()
         
         # Start OpenCV window
-        cv2.startWindowThread()
+        if not args.headless:
+            cv2.startWindowThread()
         
+        # pollKey() (OpenCV >= 4.5) handles GUI events without waitKey(1)'s up-to-1ms sleep
+        poll_key = getattr(cv2, 'pollKey', None) or (lambda: cv2.waitKey(1))
+        
+        loop_count = 0
         while True:
             # Get frame
             frame = tracker.get_frame()
             
             # Run detection (returns both results dict and yolo_result object)
             results, yolo_result = tracker.detect(frame)
+            loop_count += 1
             
-            # Draw detections using YOLO's default overlay + custom arm angle info
-            if yolo_result is not None:
-                frame_bgr = draw_detections(frame, yolo_result, results)
-            else:
-                # Fallback if no detections
-                frame_bgr = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-            
-            # Display frame
-            cv2.imshow('YOLO Pose Tracking - Press q to quit', frame_bgr)
-            
-            # Handle keyboard input
-            key = cv2.waitKey(1) & 0xFF
-            if key == ord('q') or key == 27:  # 'q' or ESC
-                break
+            if not args.headless:
+                # Overlay drawing (plot() alone is dozens of draw calls) only on rendered frames
+                if loop_count % render_every == 0:
+                    # Draw detections using YOLO's default overlay + custom arm angle info
+                    if yolo_result is not None:
+                        frame_bgr = draw_detections(frame, yolo_result, results)
+                    else:
+                        # Fallback if no detections
+                        frame_bgr = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+                    
+                    # Display frame
+                    cv2.imshow('YOLO Pose Tracking - Press q to quit', frame_bgr)
+                
+                # Handle keyboard input (every frame, so quitting stays responsive)
+                key = poll_key() & 0xFF
+                if key == ord('q') or key == 27:  # 'q' or ESC
+                    break
             
             # Print to terminal periodically (every 10 frames to avoid spam)
             if results['poses'] and len(results['poses']) > 0:
@@ -779,7 +838,8 @@ def main():
     finally:
         if 'tracker' in locals():
             tracker.stop()
-        cv2.destroyAllWindows()
+        if not args.headless:
+            cv2.destroyAllWindows()
         print("[TEST] Test complete")
 
 
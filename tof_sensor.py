@@ -20,8 +20,10 @@ class ToFSensor:
             GPIO.setup(config.ToF_DIGITAL_PIN, GPIO.IN, pull_up_down=GPIO.PUD_DOWN)
         
         # Simple debouncing: require multiple consecutive HIGH readings
-        self.high_count = 0
+        # Last high_threshold raw readings are kept as bits; all ones == enough consecutive HIGHs
         self.high_threshold = getattr(config, 'TOF_HIGH_COUNT_THRESHOLD', 4)
+        self.high_mask = (1 << max(0, self.high_threshold)) - 1
+        self.high_history = 0
 
         if config.DEBUG_TOF:
             print(f"[ToF] Initialized digital input on pin {config.ToF_DIGITAL_PIN} with pull-down resistor")
@@ -29,18 +31,15 @@ class ToFSensor:
     def state(self) -> bool:
         if config.USE_GPIO:    
            raw_val = GPIO.input(config.ToF_DIGITAL_PIN)
-           # Filter noise: require multiple consecutive HIGH readings
-           if raw_val:
-               self.high_count += 1
-           else:
-               self.high_count = 0
+           # Filter noise: shift the reading into the history (a LOW clears the run)
+           self.high_history = ((self.high_history << 1) | bool(raw_val)) & self.high_mask
            # Only return HIGH if we have enough consecutive HIGH readings
-           val = (self.high_count >= self.high_threshold)
+           val = (self.high_history == self.high_mask)
         else: 
             val = False
         
         if config.DEBUG_TOF:
-            print(f"[ToF] State -> {val} (raw={raw_val if config.USE_GPIO else 'N/A'}, count={self.high_count})")
+            print(f"[ToF] State -> {val} (raw={raw_val if config.USE_GPIO else 'N/A'}, history={self.high_history:0{max(1, self.high_threshold)}b})")
 
         return val
     
@@ -191,12 +191,6 @@ class VisualDetector:
         if config.CAMERA_FLIP_VERTICAL:
             array = cv2.flip(array, 0)  # Vertical flip
         
-        # Fix color channel swap (red/blue) - swap before converting to BGR
-        if config.CAMERA_SWAP_RB:
-            # Swap red and blue channels: RGB -> BGR -> RGB (swaps R and B)
-            array = cv2.cvtColor(array, cv2.COLOR_RGB2BGR)
-            array = cv2.cvtColor(array, cv2.COLOR_BGR2RGB)
-        
         # Convert to BGR for OpenCV
         frame = cv2.cvtColor(array, cv2.COLOR_RGB2BGR)
         return frame
@@ -5,7 +5,6 @@ Commands: FORWARD, LEFT, RIGHT, STOP, TURN AROUND, AUTOMATIC MODE
 """
 
 import os
-import time
 import json
 from dotenv import load_dotenv
 
@@ -328,8 +327,7 @@ if __name__ == '__main__':
                 print(f"✓ Command: {command}")
             else:
                 print("✗ No command recognized, try again")
-            
-            time.sleep(0.5)
+            # No sleep: listen() blocks on the microphone and paces the loop
     
     except KeyboardInterrupt:
         print("\nStopping...")
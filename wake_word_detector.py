@@ -16,13 +16,12 @@ except ImportError as e:
     raise ImportError("pvporcupine not installed. Install with: pip install pvporcupine") from e
 
 import pyaudio
-import struct
 
 
 class WakeWordDetector:
     """Detects wake word using Picovoice Porcupine"""
     
-    def __init__(self, model_path, access_key=None, input_device_index=None):
+    def __init__(self, model_path, access_key=None, input_device_index=None, buffer_frames=4):
         """
         Initialize wake word detector
         
@@ -30,8 +29,12 @@ class WakeWordDetector:
             model_path: Path to .ppn wake word model file
             access_key: Picovoice access key (or None to use PICOVOICE_ACCESS_KEY env var)
             input_device_index: Optional input device index (None = use default)
+            buffer_frames: Audio buffer size in Porcupine frames (default: 4 = ~128ms at 16kHz).
+                           Larger buffers mean fewer, bigger reads (less per-read overhead,
+                           no overflows when the control loop is slow) at the cost of latency
         """
         self.model_path = model_path
+        self.buffer_frames = max(1, buffer_frames)
         self.access_key = access_key or os.getenv('PICOVOICE_ACCESS_KEY')
         self.input_device_index = input_device_index
         
@@ -49,6 +52,8 @@ class WakeWordDetector:
             )
         except Exception as e:
             raise RuntimeError(f"Failed to initialize Porcupine: {e}")
+        # Fixed for the lifetime of the engine - cache instead of looking it up every read
+        self.frame_length = self.porcupine.frame_length
         
         # Initialize audio
         try:
@@ -80,6 +85,7 @@ class WakeWordDetector:
         # List all input devices and find first valid one
         print("[WakeWord] Searching for available audio input devices...")
         valid_devices = []
+        supported_devices = []
         
         for i in range(self.audio.get_device_count()):
             try:
@@ -87,14 +93,26 @@ class WakeWordDetector:
                 if device_info['maxInputChannels'] > 0:
                     valid_devices.append((i, device_info['name']))
                     print(f"  [{i}] {device_info['name']} (channels: {device_info['maxInputChannels']})")
+                    # Cheap format query - avoids a slow failed open() on devices that
+                    # can't do Porcupine's 16-bit mono rate
+                    try:
+                        self.audio.is_format_supported(
+                            self.porcupine.sample_rate,
+                            input_device=i,
+                            input_channels=1,
+                            input_format=pyaudio.paInt16
+                        )
+                        supported_devices.append((i, device_info['name']))
+                    except ValueError:
+                        pass
             except Exception as e:
                 print(f"  [ERROR] Could not get info for device {i}: {e}")
         
         if not valid_devices:
             raise RuntimeError("No audio input devices found! Please check your microphone permissions and connections.")
         
-        # Use first valid device
-        device_index, device_name = valid_devices[0]
+        # Use first device that supports Porcupine's format (else first valid device)
+        device_index, device_name = (supported_devices or valid_devices)[0]
         print(f"[WakeWord] Selected device: [{device_index}] {device_name}")
         return device_index
     
@@ -107,7 +125,7 @@ class WakeWordDetector:
                 format=pyaudio.paInt16,
                 input=True,
                 input_device_index=self.input_device_index,
-                frames_per_buffer=self.porcupine.frame_length
+                frames_per_buffer=self.frame_length * self.buffer_frames
             )
             print("[WakeWord] Listening for 'bin diesel'...")
         except OSError as e:
@@ -147,13 +165,21 @@ class WakeWordDetector:
             return False
         
         try:
-            pcm = self.stream.read(self.porcupine.frame_length, exception_on_overflow=False)
-            pcm = struct.unpack_from("h" * self.porcupine.frame_length, pcm)
-            keyword_index = self.porcupine.process(pcm)
+            # Read everything already buffered (at least one frame) in a single call, then
+            # run Porcupine over it frame by frame - keeps up with real time even when the
+            # control loop calls detect() less often than once per frame
+            frame_length = self.frame_length
+            num_frames = max(1, self.stream.get_read_available() // frame_length)
+            pcm = self.stream.read(frame_length * num_frames, exception_on_overflow=False)
+            # Porcupine wants int16 samples, so view the raw bytes as int16 in place rather
+            # than unpacking them into a tuple (no float conversion needed here)
+            pcm = memoryview(pcm).cast('h')
             
-            if keyword_index >= 0:
-                print("[WakeWord] WAKE WORD DETECTED: 'bin diesel'")
-                return True
+            for start in range(0, frame_length * num_frames, frame_length):
+                keyword_index = self.porcupine.process(pcm[start:start + frame_length])
+                if keyword_index >= 0:
+                    print("[WakeWord] WAKE WORD DETECTED: 'bin diesel'")
+                    return True
             
             return False
         except Exception as e: